@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+衝突判定（Simulation._check_collisions）のベンチマーク
+"""
+
+from conftest import measure
+from game.game_state import GameState
+from game.simulation import Simulation
+
+
+def bench_check_collisions(benchmark, stage):
+    """プレイヤーと敵・ゴールの1フレーム分の衝突判定"""
+    simulation = Simulation()
+    simulation.stage = stage
+    simulation.start()
+    simulation.respawn()
+    
+    measure(benchmark, lambda: simulation._check_collisions(False))
+
+
+def bench_simulation_step(benchmark, stage):
+    """入力処理・更新・衝突判定を含む1ティック分の処理"""
+    simulation = Simulation()
+    simulation.stage = stage
+    simulation.start()
+    simulation.respawn()
+    inputs = Simulation.INPUT_RIGHT | Simulation.INPUT_DASH | Simulation.INPUT_JUMP
+    
+    def frame():
+        simulation.step(inputs)
+        # ゲームオーバー・クリアしたら最初からやり直す
+        if simulation.game_state.state != GameState.PLAYING:
+            simulation.start()
+            simulation.respawn()
+            
+    measure(benchmark, frame)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+強化学習用の環境（GameEnv.step・BatchSimulation.step）のベンチマーク
+"""
+
+import json
+import numpy as np
+from conftest import measure
+from game.batch import BatchSimulation
+from game.env import GameEnv
+from game.game_state import GameState
+from game.level import level_path, load_level
+from game.simulation import Simulation
+from game.stage import Stage
+
+# BatchSimulation のベンチマークのワールド数
+BATCH_WORLDS = 64
+
+# ゴールの無いレベルで Simulation と比べるティック数と、開始位置（元のゴールの手前の距離）
+BATCH_CHECK_TICKS = 200
+GOAL_APPROACH = 200
+
+
+def bench_env_step(benchmark):
+    """標準のレベルで右へダッシュジャンプし続ける1ステップ（観測の作成を含む）"""
+    env = GameEnv()
+    env.reset()
+    action = Simulation.INPUT_RIGHT | Simulation.INPUT_DASH | Simulation.INPUT_JUMP
+    
+    def step():
+        terminated, truncated = env.step(action)[2:4]
+        if terminated or truncated:
+            env.reset()
+            
+    measure(benchmark, step)
+
+
+def bench_batch_step_without_goal(benchmark, tmp_path):
+    """ゴールの無いレベルでの BatchSimulation の1ティック（全ワールドで右へダッシュジャンプ）"""
+    # 標準のレベルからゴールを除いたレベル
+    with open(level_path(Stage.DEFAULT_LEVEL), encoding="utf-8") as f:
+        data = json.load(f)
+    del data["goal"]
+    path = str(tmp_path / "no_goal.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+        
+    action = Simulation.INPUT_RIGHT | Simulation.INPUT_DASH | Simulation.INPUT_JUMP
+    inputs = np.full(BATCH_WORLDS, action)
+    
+    # 元のゴールの手前から右へ進み、ゴールの位置を通り過ぎても Simulation と同じ結果になること
+    goal_x, _ = load_level(Stage.DEFAULT_LEVEL).goal
+    x, y = goal_x - GOAL_APPROACH, data["start"][1]
+    batch = BatchSimulation(1, level=path)
+    simulation = Simulation(level=path)
+    batch.start()
+    simulation.start()
+    batch.player_x[0] = x
+    batch.player_y[0] = y
+    batch.player_float_x[0] = x
+    batch.player_float_y[0] = y
+    simulation.player.reset_position(x, y)
+    walk = Simulation.INPUT_RIGHT | Simulation.INPUT_DASH
+    passed = False
+    for _ in range(BATCH_CHECK_TICKS):
+        batch.step(np.full(1, walk))
+        simulation.step(walk)
+        assert (batch.player_x[0], batch.player_y[0]) == simulation.player.rect.topleft
+        assert batch.state[0] == simulation.game_state.state
+        passed = passed or batch.player_x[0] > goal_x
+    assert passed and not batch.is_cleared[0]
+    
+    batch = BatchSimulation(BATCH_WORLDS, level=path)
+    batch.start()
+    
+    def step():
+        batch.step(inputs)
+        # リトライ画面・ゲームオーバーになったワールドは最初からやり直す
+        ended = batch.state != GameState.PLAYING
+        batch.reset_stage(ended)
+        batch.start(ended)
+        
+    measure(benchmark, step)
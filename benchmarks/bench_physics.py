@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+物理演算（Player.update, Enemy.update）のベンチマーク
+"""
+
+from conftest import measure
+from game.player import Player
+
+
+def bench_player_update(benchmark, stage):
+    """プレイヤーの1フレーム分の更新（右にダッシュしながらジャンプし続ける）"""
+    start_x, start_y = stage.get_start_position()
+    player = Player(start_x, start_y)
+    blocks = stage.block_grid
+    
+    def frame():
+        player.move_right(True)
+        player.jump()
+        player.update(blocks)
+        # 穴に落ちたかステージの端に着いたらスタート位置に戻す
+        if player.rect.y > stage.height or player.rect.x > stage.width - 100:
+            player.reset_position(start_x, start_y)
+            
+    measure(benchmark, frame)
+
+
+def bench_enemy_update(benchmark, stage):
+    """全ての敵の1フレーム分の更新"""
+    measure(benchmark, stage.update)
+
+
+def bench_enemy_update_lod(benchmark, stage):
+    """全ての敵の1フレーム分の更新（画面から離れた敵の更新を省略する場合。カメラはステージの中央）"""
+    stage.enable_enemy_lod(800)
+    camera_offset_x = stage.width // 2
+    
+    def frame():
+        stage.update(camera_offset_x)
+        
+    measure(benchmark, frame)
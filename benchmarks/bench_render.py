@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+描画（Game.draw）のベンチマーク
+"""
+
+import threading
+import pytest
+from conftest import measure
+from game.main import Game
+
+# 1フレームあたりのスクロール量（ダッシュ時のプレイヤーの速度程度）
+SCROLL_SPEED = 8
+
+# ステージの作成中に描画するスタート画面のフレーム数（毎フレーム1ティック以上進むようにフレームレートを制限する）
+TITLE_FRAMES = 10
+TITLE_FPS = 30
+
+
+class _StopRun(Exception):
+    """Game.run のループを抜けるための例外"""
+
+
+class SlowBuildGame(Game):
+    """ステージの作成を止めておき、その間にスタート画面を描画したフレーム数を数えるゲーム"""
+    
+    def __init__(self):
+        """初期化（ステージの作成は release が呼ばれるまで終わらない）"""
+        self._released = threading.Event()
+        self.frames = 0
+        self.title_frames = 0
+        super().__init__(max_fps=TITLE_FPS)
+        
+    def release(self):
+        """ステージの作成を再開する"""
+        self._released.set()
+        
+    def _build_world(self, level, seed, endless_seed):
+        """release が呼ばれるまで待ってからステージを作成"""
+        self._released.wait()
+        return super()._build_world(level, seed, endless_seed)
+        
+    def draw(self, alpha=1.0):
+        """描画し、ステージの作成中なら数える（TITLE_FRAMES フレーム描画したらループを抜ける）"""
+        super().draw(alpha)
+        self.frames += 1
+        if not self._world_task.done():
+            self.title_frames += 1
+        if self.frames >= TITLE_FRAMES:
+            raise _StopRun
+
+
+@pytest.mark.parametrize("dirty_rects", (False, True), ids=("full", "dirty"))
+def bench_game_draw(benchmark, stage, dirty_rects):
+    """ステージをスクロールしながらの1フレーム分の描画"""
+    game = Game(dirty_rects=dirty_rects)
+    game.simulation.stage = stage
+    game.static_layer.invalidate(stage)
+    game.simulation.start()
+    simulation = game.simulation
+    max_offset = stage.width - game.screen_width
+    
+    def frame():
+        simulation.camera_offset_x += SCROLL_SPEED
+        if simulation.camera_offset_x > max_offset:
+            simulation.camera_offset_x = 0
+        game.draw()
+        
+    measure(benchmark, frame)
+
+
+def bench_time_to_first_frame(benchmark):
+    """Game の作成からスタート画面の最初の描画まで（ステージと音声の準備は待たない）"""
+    games = []
+    
+    def wait_previous():
+        # 前回の別スレッドの初期化を終わらせてから計測する
+        while games:
+            game = games.pop()
+            game._world_task.result()
+            game.audio.close()
+            
+    def first_frame():
+        game = Game()
+        game.draw()
+        games.append(game)
+        
+    benchmark.pedantic(first_frame, setup=wait_previous, rounds=10)
+    wait_previous()
+    
+    # ステージの作成が終わらない間も、ゲームループがスタート画面を描画し続けること
+    game = SlowBuildGame()
+    timer = threading.Timer(TITLE_FRAMES * 2 / TITLE_FPS + 1.0, game.release)
+    timer.start()
+    try:
+        with pytest.raises(_StopRun):
+            game.run()
+    finally:
+        timer.cancel()
+        game.release()
+        game._world_task.result()
+        game.audio.close()
+    assert game.title_frames == TITLE_FRAMES
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ステージ構築（Stage._create_stage）のベンチマーク
+"""
+
+import shutil
+import pytest
+from conftest import measure
+from game import level as level_module
+from game.level import VERSION, cache_path, compile_level, level_path, load_level
+from game.stage import Stage
+from layouts import BenchStage
+
+
+def bench_create_stage(benchmark, layout):
+    """ステージの構築（タイルマップ・ブロック・敵・空間インデックス）"""
+    width, enemy_count, density = layout
+    measure(benchmark, lambda: BenchStage(width, 600, enemy_count, density))
+
+
+def bench_reset_stage(benchmark, stage):
+    """ステージのリセット（敵を初期配置に戻す）"""
+    measure(benchmark, stage.reset)
+
+
+@pytest.mark.parametrize("damage", ("version", "empty"))
+def bench_load_level_damaged_cache(benchmark, tmp_path, damage):
+    """コンパイル済みファイルが読み込めない場合の読み込み（コンパイルし直す）
+    
+    形式のバージョンが違うファイルと、書き込み途中で空になったファイルを用意する。
+    """
+    source = str(tmp_path / "level.json")
+    shutil.copy(level_path(Stage.DEFAULT_LEVEL), source)
+    target = cache_path(source)
+    
+    def damage_cache():
+        # 読み込み済みのレベルを捨ててから、コンパイル済みファイルを壊す
+        loaded = level_module._loaded.pop(source, None)
+        if loaded is not None:
+            loaded.close()
+        compile_level(source, target)
+        if damage == "version":
+            with open(target, "r+b") as f:
+                f.seek(4)  # マジックの直後のバージョン
+                f.write(bytes((VERSION + 1,)))
+        else:
+            open(target, "wb").close()
+            
+    benchmark.pedantic(load_level, args=(source,), setup=damage_cache, rounds=10)
+    
+    # コンパイルし直したファイルから、元のレベルと同じステージを作成できること
+    expected = load_level(Stage.DEFAULT_LEVEL)
+    level = load_level(source)
+    assert list(level.iter_rects()) == list(expected.iter_rects())
+    assert list(level.iter_enemies()) == list(expected.iter_enemies())
+    assert Stage(height=600, level=level).width == expected.width
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ベンチマーク共通の設定
+"""
+
+import os
+import sys
+import tracemalloc
+
+# ウィンドウ・音声デバイスなしで実行する
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# ゲームディレクトリをPythonパスに追加
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import pytest
+from layouts import LAYOUTS, BenchStage, layout_id
+
+# メモリ割り当ての計測で呼び出す回数
+ALLOCATION_CALLS = 100
+
+
+@pytest.fixture(scope="session", autouse=True)
+def pygame_session():
+    """pygameの初期化（ダミーのビデオドライバを使用）"""
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+@pytest.fixture(params=LAYOUTS, ids=layout_id)
+def layout(request):
+    """ベンチマークするステージの構成"""
+    return request.param
+
+
+@pytest.fixture
+def stage(layout):
+    """ベンチマーク用のステージ"""
+    width, enemy_count, density = layout
+    return BenchStage(width, 600, enemy_count, density)
+
+
+def measure(benchmark, func):
+    """メモリ割り当てを記録してからベンチマークを実行
+    
+    1回あたりの時間は pytest-benchmark が計測し、メモリ割り当ては tracemalloc で
+    別に計測して extra_info に記録する（計測中の時間には含めない）。
+    
+    Args:
+        benchmark: pytest-benchmark のフィクスチャ
+        func (callable): 1フレーム分の処理を行う関数
+        
+    Returns:
+        object: 最後の呼び出しの戻り値
+    """
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in range(ALLOCATION_CALLS):
+            func()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        
+    # 呼び出し中に一時的に確保した量の最大値と、1回あたりに残った量（バイト）
+    benchmark.extra_info["alloc_peak_bytes"] = peak - before
+    benchmark.extra_info["alloc_retained_bytes_per_call"] = (current - before) / ALLOCATION_CALLS
+    return benchmark(func)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ベンチマーク用のステージ生成モジュール
+"""
+
+import random
+from game.enemy import Enemy
+from game.stage import Block, Goal, Stage
+
+# ベンチマークするステージの構成: (ステージの幅, 敵の数, 障害物の密度)
+LAYOUTS = (
+    # ステージの長さ（敵・障害物の密度は一定）
+    (3000, 4, 0.1),
+    (10000, 16, 0.1),
+    (30000, 48, 0.1),
+    (100000, 160, 0.1),
+    # 敵の数
+    (10000, 100, 0.1),
+    (10000, 400, 0.1),
+    # 障害物の密度
+    (10000, 16, 0.3),
+    (10000, 16, 0.6),
+)
+
+
+def layout_id(layout):
+    """パラメータ化したテストのID
+    
+    Args:
+        layout (tuple): (ステージの幅, 敵の数, 障害物の密度)
+        
+    Returns:
+        str: ID（例: "w3000-e4-d0.1"）
+    """
+    width, enemies, density = layout
+    return f"w{width}-e{enemies}-d{density}"
+
+
+class BenchStage(Stage):
+    """ベンチマーク用のステージ
+    
+    元のステージと同じ構成（穴を挟んだ地面、高さ100/150pxの障害物、地面の上の敵）を
+    指定した幅・敵の数・障害物の密度で並べる。配置は幅から決まる乱数で決定する。
+    """
+    
+    # 地面の1区間の長さと、区間の間の穴の幅
+    SEGMENT_WIDTH = 800
+    GAP_WIDTH = 200
+    
+    GROUND_Y = 500
+    
+    def __init__(self, width, height, enemy_count, density):
+        """初期化
+        
+        Args:
+            width (int): ステージの幅
+            height (int): ステージの高さ
+            enemy_count (int): 敵の数
+            density (float): 地面のタイルのうち障害物を置く割合
+        """
+        self.enemy_count = enemy_count
+        self.density = density
+        super().__init__(width, height)
+        
+    def _create_stage(self):
+        """ステージを作成"""
+        rng = random.Random(self.width)
+        tile = self.TILE_SIZE
+        ground_y = self.GROUND_Y
+        
+        # 地面（最後の区間はステージの右端まで）
+        period = self.SEGMENT_WIDTH + self.GAP_WIDTH
+        x = 0
+        while x < self.width:
+            length = self.SEGMENT_WIDTH if x + period < self.width else self.width - x
+            self.tilemap.fill_rect(x, ground_y, length, tile)
+            x += period
+            
+        # 障害物（スタート地点とゴール付近には置かない）
+        # 敵は障害物の無いタイルに置く
+        free = []
+        for col in range(4, self.width // tile - 6):
+            if not self.tilemap.is_solid(col, ground_y // tile):
+                continue
+            if rng.random() < self.density:
+                height = rng.choice((100, 150))
+                self.tilemap.fill_rect(col * tile, ground_y - height, tile, height)
+            else:
+                free.append(col)
+                
+        # タイルマップの連続区間ごとにブロックを作成
+        for rect in self.tilemap.rects():
+            self.blocks.add(Block(rect.x, rect.y, rect.width, rect.height))
+            
+        # 敵（障害物の無いタイルに均等に配置）
+        if free:
+            step = len(free) / self.enemy_count
+            for i in range(self.enemy_count):
+                col = free[int(i * step)]
+                self.enemies.add(Enemy(col * tile + 10, ground_y - 30))
+                
+        # ゴール
+        self.goal = Goal(self.width - 200, ground_y - 80)
+        
+        # ブロックの空間インデックスを構築
+        self._build_block_grid()
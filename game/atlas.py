@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+画像アトラスモジュール（スプライトの画像を共有する）
+"""
+
+import pygame
+
+# 作成済みの画像（(幅, 高さ, 色) -> Surface）
+_images = {}
+
+# 画像を変換したときの画面（画面が作り直されたら画像も作り直す）
+_display = None
+
+
+def solid_image(width, height, color):
+    """単色の画像を取得
+    
+    同じ大きさ・色の画像は一度だけ作成し、全てのスプライトで共有する。
+    画面が作成済みなら画面のピクセル形式に変換する（色が (r, g, b, a) の場合は透過付きで変換する）。
+    共有する画像のため、取得した画像に描き込んではならない。
+    
+    Args:
+        width (int): 幅
+        height (int): 高さ
+        color (tuple): 色 (r, g, b) または (r, g, b, a)
+        
+    Returns:
+        pygame.Surface: 画像
+    """
+    global _display
+    
+    # 画面が作成・変更された後は、変換前（または別の画面向け）の画像を使わない
+    display = pygame.display.get_surface()
+    if display is not _display:
+        _images.clear()
+        _display = display
+        
+    key = (width, height, color)
+    image = _images.get(key)
+    if image is None:
+        alpha = len(color) == 4
+        image = pygame.Surface((width, height), pygame.SRCALPHA if alpha else 0)
+        image.fill(color)
+        if display is not None:
+            image = image.convert_alpha() if alpha else image.convert()
+        _images[key] = image
+    return image
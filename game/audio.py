@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+音声モジュール（BGMと効果音の再生を別スレッドで行う）
+"""
+
+from array import array
+import atexit
+import math
+import queue
+import threading
+import pygame
+from game.simulation import Simulation
+
+
+class AudioManager:
+    """BGMと効果音の再生を管理するクラス
+    
+    ミキサーの初期化、BGMの読み込み・再生・停止、効果音の再生は全て専用のスレッドで行い、
+    ゲームループからは命令をキューに入れるだけにする（ディスクの読み込みなどで描画が止まらない）。
+    効果音は初期化時に波形を合成して Sound に変換しておき、決まった数のチャンネルで再生する。
+    空いているチャンネルがない場合は、最も前に再生を始めたチャンネルの音を止めて再生する。
+    """
+    
+    # 効果音に使うチャンネル数
+    CHANNELS = 8
+    
+    # 音量
+    MUSIC_VOLUME = 0.25  # BGM（元の半分）
+    SOUND_VOLUME = 0.3   # 効果音
+    
+    # 効果音（イベント -> (開始周波数Hz, 終了周波数Hz, 長さ秒)。周波数を変えながら鳴らす矩形波）
+    SOUNDS = {
+        Simulation.EVENT_STOMP: (600, 1200, 0.08),
+        Simulation.EVENT_DAMAGE: (400, 150, 0.25),
+        Simulation.EVENT_LOSE_LIFE: (300, 60, 0.6),
+        Simulation.EVENT_CLEAR: (500, 1500, 0.5),
+    }
+    
+    def __init__(self, music_path=None):
+        """初期化（スレッドを起動してミキサーの初期化を始める）
+        
+        Args:
+            music_path (str): BGMファイルのパス（Noneなら再生しない）
+        """
+        self.music_path = music_path
+        
+        # ミキサーを初期化できたかどうか（初期化が終わるまではFalse）
+        self.ready = False
+        
+        # 効果音（イベント -> Sound）とチャンネル
+        self.sounds = {}
+        self._channels = []
+        self._started = []  # チャンネルごとの最後に再生を始めた順番
+        self._play_count = 0
+        
+        # 命令のキュー（Noneでスレッドを終了する）
+        self._commands = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        
+        # 終了時に pygame.quit より先にスレッドを終わらせる（初期化中に終了すると例外になる）
+        atexit.register(self.close)
+        
+    def set_music(self, playing):
+        """BGMを再生または停止する（再生中に再生を指示した場合はそのまま続ける）
+        
+        Args:
+            playing (bool): 再生するかどうか
+        """
+        self._commands.put((self._set_music, playing))
+        
+    def play(self, event):
+        """効果音を再生する
+        
+        Args:
+            event (int): 効果音に対応するイベント（Simulation.EVENT_*）
+        """
+        self._commands.put((self._play, event))
+        
+    def play_events(self, events):
+        """イベントのリストに対応する効果音を再生する
+        
+        Args:
+            events (list): Simulation.events
+        """
+        for event in events:
+            self.play(event)
+            
+    def close(self):
+        """残っている命令を処理してからスレッドを終了する"""
+        atexit.unregister(self.close)
+        if self._thread.is_alive():
+            self._commands.put(None)
+            self._thread.join()
+            
+    def _run(self):
+        """スレッドの処理（初期化してから命令を順に実行する）"""
+        self.ready = self._init_mixer()
+        while True:
+            command = self._commands.get()
+            if command is None:
+                break
+            if self.ready:
+                func, arg = command
+                func(arg)
+                
+    def _init_mixer(self):
+        """ミキサーを初期化し、BGMと効果音を読み込む
+        
+        Returns:
+            bool: ミキサーを初期化できたかどうか
+        """
+        try:
+            pygame.mixer.init()
+        except pygame.error as e:
+            print(f"音声の初期化に失敗しました: {e}")
+            return False
+            
+        if self.music_path is not None:
+            try:
+                pygame.mixer.music.load(self.music_path)
+                pygame.mixer.music.set_volume(self.MUSIC_VOLUME)
+            except pygame.error as e:
+                print(f"BGMの読み込みに失敗しました: {e}")
+                self.music_path = None
+                
+        # 効果音専用のチャンネル（Sound.play が自動で選ぶチャンネルとは分ける）
+        pygame.mixer.set_num_channels(self.CHANNELS)
+        pygame.mixer.set_reserved(self.CHANNELS)
+        self._channels = [pygame.mixer.Channel(i) for i in range(self.CHANNELS)]
+        self._started = [0] * self.CHANNELS
+        
+        frequency, size, channels = pygame.mixer.get_init()
+        if size != -16:
+            print(f"効果音を作成できないサンプル形式です: {size}")
+            return True
+        for event, (start, end, duration) in self.SOUNDS.items():
+            sound = pygame.mixer.Sound(buffer=self._synthesize(start, end, duration, frequency, channels))
+            sound.set_volume(self.SOUND_VOLUME)
+            self.sounds[event] = sound
+        return True
+        
+    @staticmethod
+    def _synthesize(start, end, duration, frequency, channels):
+        """周波数を変えながら鳴らす矩形波を合成（だんだん小さくなる）
+        
+        Args:
+            start (float): 開始周波数（Hz）
+            end (float): 終了周波数（Hz）
+            duration (float): 長さ（秒）
+            frequency (int): サンプリング周波数（Hz）
+            channels (int): チャンネル数
+            
+        Returns:
+            bytes: 符号付き16ビットのサンプル列
+        """
+        count = int(duration * frequency)
+        samples = array("h")
+        phase = 0.0
+        for i in range(count):
+            t = i / count
+            phase += (start + (end - start) * t) / frequency
+            value = 32767 if math.fmod(phase, 1.0) < 0.5 else -32767
+            samples.extend([int(value * (1.0 - t))] * channels)
+        return samples.tobytes()
+        
+    def _set_music(self, playing):
+        """BGMを再生または停止する（スレッドで実行する）
+        
+        Args:
+            playing (bool): 再生するかどうか
+        """
+        if self.music_path is None:
+            return
+        if playing:
+            if not pygame.mixer.music.get_busy():
+                pygame.mixer.music.play(-1)  # -1を指定すると無限ループ
+        else:
+            pygame.mixer.music.stop()
+            
+    def _play(self, event):
+        """効果音を再生する（スレッドで実行する）
+        
+        Args:
+            event (int): 効果音に対応するイベント
+        """
+        sound = self.sounds.get(event)
+        if sound is None:
+            return
+            
+        # 空いているチャンネルがなければ、最も前に再生を始めたチャンネルを使う
+        index = min(range(self.CHANNELS), key=self._started.__getitem__)
+        for i, channel in enumerate(self._channels):
+            if not channel.get_busy():
+                index = i
+                break
+                
+        self._play_count += 1
+        self._started[index] = self._play_count
+        self._channels[index].play(sound)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+バックグラウンド処理モジュール（起動時の重い初期化を別スレッドで行う）
+"""
+
+import threading
+
+
+class BackgroundTask:
+    """関数を別スレッドで1回だけ実行し、結果を後から受け取るクラス"""
+    
+    def __init__(self, func, *args):
+        """初期化（すぐに実行を開始する）
+        
+        Args:
+            func (callable): 実行する関数
+            *args: 関数に渡す引数
+        """
+        self._func = func
+        self._args = args
+        self._result = None
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        
+    def _run(self):
+        """別スレッドで関数を実行し、結果か例外を保存する"""
+        try:
+            self._result = self._func(*self._args)
+        except Exception as e:
+            self._error = e
+            
+    def done(self):
+        """実行が終わったかどうか
+        
+        Returns:
+            bool: 終わっていればTrue
+        """
+        return not self._thread.is_alive()
+        
+    def result(self):
+        """実行が終わるまで待って結果を取得
+        
+        Returns:
+            object: 関数の戻り値
+            
+        Raises:
+            Exception: 関数が送出した例外
+        """
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self._result
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+バッチシミュレーションモジュール（NumPyによる複数ワールドの一括計算）
+"""
+
+import numpy as np
+from game.enemy import Enemy
+from game.game_state import GameState
+from game.player import Player
+from game.simulation import Simulation
+from game.stage import Stage
+
+# 衝突が無い場合の番兵（最も手前の辺を求めるときに使う）
+_INT_MAX = np.iinfo(np.int64).max
+_INT_MIN = np.iinfo(np.int64).min
+
+class BatchSimulation:
+    """バッチシミュレーションクラス
+    
+    同じステージ構成のワールドをN個まとめて保持し、プレイヤーと敵の状態を
+    NumPy配列（構造体の配列ではなく配列の構造体）で一括して進める。
+    1ワールドごとの結果は Simulation と完全に一致する。
+    """
+    
+    # プレイヤーと敵の大きさ
+    PLAYER_WIDTH = 30
+    PLAYER_HEIGHT = 50
+    ENEMY_WIDTH = 30
+    ENEMY_HEIGHT = 30
+    
+    # 倒された敵が削除される高さ
+    ENEMY_REMOVE_Y = 1000
+    
+    def __init__(self, num_worlds, screen_width=800, screen_height=600, level=None):
+        """初期化
+        
+        Args:
+            num_worlds (int): ワールド数
+            screen_width (int): 画面の幅（カメラの計算に使用）
+            screen_height (int): 画面の高さ（落下判定に使用）
+            level (str): レベル名またはJSONファイルのパス（Noneなら標準のレベル）
+        """
+        self.num_worlds = num_worlds
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        
+        # ステージ構成（全ワールド共通）を読み取る
+        stage = Stage(height=screen_height, level=level)
+        self.stage_width = stage.width
+        self.start_x, self.start_y = stage.get_start_position()
+        
+        # ブロック（空間インデックスの登録順 = 衝突判定の順）
+        block_rects = [block.rect for block in stage.block_grid]
+        self.block_left = np.array([r.left for r in block_rects], dtype=np.int64)
+        self.block_top = np.array([r.top for r in block_rects], dtype=np.int64)
+        self.block_right = np.array([r.right for r in block_rects], dtype=np.int64)
+        self.block_bottom = np.array([r.bottom for r in block_rects], dtype=np.int64)
+        
+        # ゴール
+        # ゴール（ゴールの無いレベルではNone）
+        if stage.goal is not None:
+            goal = stage.goal.rect
+            self.goal_rect = (goal.left, goal.top, goal.right, goal.bottom)
+        else:
+            self.goal_rect = None
+        
+        # 敵の初期配置（グループの順 = 更新・衝突判定の順）
+        self.enemy_start_x = np.array([e.rect.x for e in stage.enemies], dtype=np.int64)
+        self.enemy_start_y = np.array([e.rect.y for e in stage.enemies], dtype=np.int64)
+        self.num_enemies = len(self.enemy_start_x)
+        
+        # ゲーム状態
+        n, e = num_worlds, self.num_enemies
+        self.state = np.full(n, GameState.START, dtype=np.int8)
+        self.lives = np.full(n, 2, dtype=np.int64)
+        self.is_cleared = np.zeros(n, dtype=bool)
+        self.camera_offset_x = np.zeros(n, dtype=np.int64)
+        self.frame = 0
+        
+        # プレイヤーの状態
+        self.player_float_x = np.zeros(n)
+        self.player_float_y = np.zeros(n)
+        self.player_x = np.zeros(n, dtype=np.int64)
+        self.player_y = np.zeros(n, dtype=np.int64)
+        self.player_vel_x = np.zeros(n)
+        self.player_vel_y = np.zeros(n)
+        self.player_state = np.zeros(n, dtype=np.int8)
+        
+        # 敵の状態
+        self.enemy_float_x = np.zeros((n, e))
+        self.enemy_float_y = np.zeros((n, e))
+        self.enemy_x = np.zeros((n, e), dtype=np.int64)
+        self.enemy_y = np.zeros((n, e), dtype=np.int64)
+        self.enemy_direction = np.zeros((n, e), dtype=np.int64)
+        self.enemy_state = np.zeros((n, e), dtype=np.int8)
+        self.enemy_alive = np.zeros((n, e), dtype=bool)
+        
+        self.reset_stage()
+        
+    def _mask(self, mask):
+        """対象ワールドのマスクを取得
+        
+        Args:
+            mask (numpy.ndarray): 対象ワールドのboolマスク（Noneなら全ワールド）
+            
+        Returns:
+            numpy.ndarray: boolマスク
+        """
+        if mask is None:
+            return np.ones(self.num_worlds, dtype=bool)
+        return np.asarray(mask, dtype=bool)
+        
+    def start(self, mask=None):
+        """ゲームを開始する（GameState.start_game に相当）
+        
+        Args:
+            mask (numpy.ndarray): 対象ワールドのboolマスク（Noneなら全ワールド）
+        """
+        mask = self._mask(mask)
+        self.state[mask] = GameState.PLAYING
+        self.lives[mask] = 2
+        self.is_cleared[mask] = False
+        
+    def retry(self, mask=None):
+        """リトライする（リトライ画面で「Yes」を選んだ場合に相当）
+        
+        Args:
+            mask (numpy.ndarray): 対象ワールドのboolマスク（Noneなら全ワールド）
+        """
+        mask = self._mask(mask)
+        self.state[mask] = GameState.PLAYING
+        self.reset_stage(mask)
+        
+    def respawn(self, mask=None):
+        """プレイヤーとカメラをスタート位置に戻す
+        
+        Args:
+            mask (numpy.ndarray): 対象ワールドのboolマスク（Noneなら全ワールド）
+        """
+        mask = self._mask(mask)
+        self.player_x[mask] = self.start_x
+        self.player_y[mask] = self.start_y
+        self.player_float_x[mask] = float(self.start_x)
+        self.player_float_y[mask] = float(self.start_y)
+        self.player_vel_x[mask] = 0
+        self.player_vel_y[mask] = 0
+        self.player_state[mask] = Player.FALLING
+        self.camera_offset_x[mask] = 0
+        
+    def reset_stage(self, mask=None):
+        """敵を初期配置に戻し、プレイヤーをスタート位置に戻す
+        
+        Args:
+            mask (numpy.ndarray): 対象ワールドのboolマスク（Noneなら全ワールド）
+        """
+        mask = self._mask(mask)
+        self.enemy_x[mask] = self.enemy_start_x
+        self.enemy_y[mask] = self.enemy_start_y
+        self.enemy_float_x[mask] = self.enemy_start_x
+        self.enemy_float_y[mask] = self.enemy_start_y
+        self.enemy_direction[mask] = Enemy.DIRECTION_LEFT
+        self.enemy_state[mask] = Enemy.ACTIVE
+        self.enemy_alive[mask] = True
+        self.respawn(mask)
+        
+    def _block_hits(self, x, y, width, height):
+        """ブロックとの衝突判定
+        
+        Args:
+            x (numpy.ndarray): 矩形のX座標
+            y (numpy.ndarray): 矩形のY座標
+            width (int or numpy.ndarray): 矩形の幅
+            height (int or numpy.ndarray): 矩形の高さ
+            
+        Returns:
+            numpy.ndarray: 衝突の有無（最後の軸がブロック）
+        """
+        x = x[..., None]
+        y = y[..., None]
+        width = np.asarray(width)[..., None]
+        height = np.asarray(height)[..., None]
+        return ((x < self.block_right) & (x + width > self.block_left)
+                & (y < self.block_bottom) & (y + height > self.block_top))
+                
+    @staticmethod
+    def _nearest(hits, edges, direction):
+        """衝突したブロックのうち、移動方向で最も手前のブロックの辺の座標
+        
+        Args:
+            hits (numpy.ndarray): 衝突の有無（最後の軸がブロック）
+            edges (numpy.ndarray): ブロックの辺の座標（左端・右端・上端・下端のいずれか）
+            direction (int): 移動方向（正なら最小値、負なら最大値を取る）
+            
+        Returns:
+            numpy.ndarray: 辺の座標（衝突が無い場合は不定）
+        """
+        if direction > 0:
+            return np.where(hits, edges, _INT_MAX).min(axis=-1, initial=_INT_MAX)
+        return np.where(hits, edges, _INT_MIN).max(axis=-1, initial=_INT_MIN)
+        
+    def step(self, inputs):
+        """全ワールドを1ティック進める
+        
+        Args:
+            inputs (numpy.ndarray): ワールドごとの入力ビット（Simulation.INPUT_*の論理和）
+            
+        Returns:
+            numpy.ndarray: 更新後のゲーム状態
+        """
+        inputs = np.asarray(inputs)
+        active = self.state == GameState.PLAYING
+        self.frame += 1
+        if not active.any():
+            return self.state
+            
+        is_dashing = (inputs & Simulation.INPUT_DASH) != 0
+        self._update_input(active, inputs, is_dashing)
+        self._update_player(active)
+        self._update_enemies(active)
+        self._update_camera(active)
+        self._check_collisions(active, is_dashing)
+        return self.state
+        
+    def _update_input(self, active, inputs, is_dashing):
+        """入力処理（Player.move_left / move_right / stop / jump に相当）"""
+        speed = np.where(is_dashing, Player.DASH_SPEED, Player.MOVE_SPEED)
+        left = (inputs & Simulation.INPUT_LEFT) != 0
+        right = (inputs & Simulation.INPUT_RIGHT) != 0
+        vel_x = np.where(left, -speed, np.where(right, speed, 0))
+        self.player_vel_x = np.where(active, vel_x, self.player_vel_x)
+        
+        jump = active & ((inputs & Simulation.INPUT_JUMP) != 0) & (self.player_state == Player.STANDING)
+        self.player_vel_y[jump] = -Player.JUMP_POWER
+        self.player_state[jump] = Player.JUMPING
+        
+    def _update_player(self, active):
+        """プレイヤーの更新（Player.update に相当）"""
+        w, h = self.PLAYER_WIDTH, self.PLAYER_HEIGHT
+        
+        # ダメージ状態はブロックとの衝突判定を行わず落下するだけ
+        damaged = active & (self.player_state == Player.DAMAGED)
+        self.player_vel_y[damaged] += Player.GRAVITY
+        self.player_float_y[damaged] += self.player_vel_y[damaged]
+        self.player_y[damaged] = np.trunc(self.player_float_y[damaged])
+        
+        moving = active & ~damaged
+        
+        # 横方向の移動（通過した範囲で最も手前のブロックに合わせる）
+        start_x = self.player_x.copy()
+        self.player_float_x[moving] += self.player_vel_x[moving]
+        self.player_x[moving] = np.trunc(self.player_float_x[moving])
+        swept_x = np.minimum(start_x, self.player_x)
+        swept_w = np.abs(self.player_x - start_x) + w
+        hits = self._block_hits(swept_x, self.player_y, swept_w, h) & moving[:, None]
+        hit = hits.any(axis=1)
+        vel_x = self.player_vel_x
+        self.player_x = np.where(hit & (vel_x > 0), self._nearest(hits, self.block_left, 1) - w,
+                                 np.where(hit & (vel_x < 0), self._nearest(hits, self.block_right, -1),
+                                          self.player_x))
+        self.player_float_x = np.where(hit, self.player_x, self.player_float_x)
+        
+        # 縦方向の移動
+        airborne = moving & ((self.player_state == Player.JUMPING) | (self.player_state == Player.FALLING))
+        self.player_vel_y[airborne] += Player.GRAVITY
+        start_y = self.player_y.copy()
+        self.player_float_y[moving] += self.player_vel_y[moving]
+        self.player_y[moving] = np.trunc(self.player_float_y[moving])
+        
+        # 下に移動中は最も上のブロックに着地し、上に移動中は最も下のブロックで止まる
+        swept_y = np.minimum(start_y, self.player_y)
+        swept_h = np.abs(self.player_y - start_y) + h
+        hits = self._block_hits(self.player_x, swept_y, w, swept_h) & moving[:, None]
+        hit = hits.any(axis=1)
+        vel_y = self.player_vel_y
+        landed = hit & (vel_y > 0)
+        bumped = hit & (vel_y < 0)
+        self.player_y = np.where(landed, self._nearest(hits, self.block_top, 1) - h,
+                                 np.where(bumped, self._nearest(hits, self.block_bottom, -1), self.player_y))
+        self.player_state[landed] = Player.STANDING
+        self.player_vel_y[bumped] = 0
+        self.player_float_y = np.where(hit, self.player_y, self.player_float_y)
+        
+        # 立っている場合は足元に何もないか確認
+        standing = moving & (self.player_state == Player.STANDING)
+        below = self._block_hits(self.player_x, self.player_y + 2, w, h).any(axis=1)
+        self.player_state[standing & ~below] = Player.FALLING
+        
+    def _update_enemies(self, active):
+        """敵の更新（Enemy.update に相当）"""
+        w = self.ENEMY_WIDTH
+        alive = self.enemy_alive & active[:, None]
+        
+        # 通常状態では現在の方向に移動
+        walking = alive & (self.enemy_state == Enemy.ACTIVE)
+        start_x = self.enemy_x.copy()
+        self.enemy_float_x[walking] += Enemy.MOVE_SPEED * self.enemy_direction[walking]
+        self.enemy_x[walking] = np.trunc(self.enemy_float_x[walking])
+        
+        # ブロックとの衝突判定（通過した範囲で最も手前のブロックに合わせて方向転換）
+        swept_x = np.minimum(start_x, self.enemy_x)
+        swept_w = np.abs(self.enemy_x - start_x) + w
+        hits = self._block_hits(swept_x, self.enemy_y, swept_w, self.ENEMY_HEIGHT) & walking[..., None]
+        hit = hits.any(axis=-1)
+        direction = self.enemy_direction
+        self.enemy_x = np.where(hit & (direction == Enemy.DIRECTION_LEFT),
+                                self._nearest(hits, self.block_right, -1),
+                                np.where(hit & (direction == Enemy.DIRECTION_RIGHT),
+                                         self._nearest(hits, self.block_left, 1) - w, self.enemy_x))
+        self.enemy_direction = np.where(hit, -direction, direction)
+        self.enemy_float_x = np.where(hit, self.enemy_x, self.enemy_float_x)
+        
+        # 倒された状態では下に落下し、画面外に出たら削除
+        falling = alive & (self.enemy_state == Enemy.DEFEATED)
+        self.enemy_float_y[falling] += Enemy.FALL_SPEED
+        self.enemy_y[falling] = np.trunc(self.enemy_float_y[falling])
+        self.enemy_alive[falling & (self.enemy_y > self.ENEMY_REMOVE_Y)] = False
+        
+    def _update_camera(self, active):
+        """カメラ位置の更新（Simulation._update_camera に相当）"""
+        half = self.screen_width // 2
+        camera = self.camera_offset_x
+        camera = np.where(self.player_x - camera > half, self.player_x - half, camera)
+        camera = np.maximum(camera, 0)
+        camera = np.minimum(camera, self.stage_width - self.screen_width)
+        self.camera_offset_x = np.where(active, camera, self.camera_offset_x)
+        
+    def _check_collisions(self, active, is_dashing):
+        """衝突判定（Simulation._check_collisions に相当）"""
+        px0 = self.player_x
+        px1 = self.player_x + self.PLAYER_WIDTH
+        py0 = self.player_y
+        py1 = self.player_y + self.PLAYER_HEIGHT
+        
+        # 敵との衝突判定（前の敵の踏みつけで速度が変わるため、敵の順に判定する）
+        bounce = np.where(is_dashing, -Player.JUMP_POWER, -10)
+        for i in range(self.num_enemies):
+            ex0 = self.enemy_x[:, i]
+            ey0 = self.enemy_y[:, i]
+            touching = (active & self.enemy_alive[:, i] & (self.enemy_state[:, i] == Enemy.ACTIVE)
+                        & (px0 < ex0 + self.ENEMY_WIDTH) & (px1 > ex0)
+                        & (py0 < ey0 + self.ENEMY_HEIGHT) & (py1 > ey0))
+            stomp = touching & (self.player_vel_y > 0) & (py1 < ey0 + self.ENEMY_HEIGHT // 2)
+            damage = touching & ~stomp
+            
+            self.enemy_state[stomp, i] = Enemy.DEFEATED
+            self.player_vel_y = np.where(stomp, bounce, self.player_vel_y)
+            
+            self.player_state[damage] = Player.DAMAGED
+            self.player_vel_x[damage] = 0
+            self.player_vel_y[damage] = 5
+            
+        # 穴に落ちた判定またはダメージ状態で画面外に出た判定
+        fell = active & (self.player_y > self.screen_height)
+        self.lives[fell] -= 1
+        self.state[fell & (self.lives < 0)] = GameState.RESULT
+        self.state[fell & (self.lives >= 0)] = GameState.RETRY
+        
+        # ゴールとの衝突判定
+        if self.goal_rect is None:
+            return
+        gx0, gy0, gx1, gy1 = self.goal_rect
+        goal = active & (px0 < gx1) & (px1 > gx0) & (py0 < gy1) & (py1 > gy0)
+        self.is_cleared[goal] = True
+        self.state[goal] = GameState.RESULT
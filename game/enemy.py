@@ -6,9 +6,13 @@
 """
 
 import pygame
+from game.atlas import solid_image
+from game.entity import Entity
 
-class Enemy(pygame.sprite.Sprite):
-    """敵クラス"""
+class Enemy(Entity):
+    """敵クラス（軽量エンティティ）"""
+    
+    __slots__ = ("float_x", "float_y", "state", "direction", "_image")
     
     # 敵の状態
     ACTIVE = 0    # 通常状態
@@ -29,16 +33,7 @@ class Enemy(pygame.sprite.Sprite):
             x (int): 初期X座標
             y (int): 初期Y座標
         """
-        super().__init__()
-        
-        # 敵の画像を作成（シンプルな四角形）
-        self.image = pygame.Surface((30, 30))
-        self.image.fill((255, 0, 0))  # 赤色
-        self.rect = self.image.get_rect()
-        
-        # 位置を設定
-        self.rect.x = x
-        self.rect.y = y
+        super().__init__(pygame.Rect(x, y, 30, 30))
         
         # 物理演算用の浮動小数点座標
         self.float_x = float(x)
@@ -48,25 +43,52 @@ class Enemy(pygame.sprite.Sprite):
         self.state = self.ACTIVE
         self.direction = self.DIRECTION_LEFT  # 初期方向は左
         
+        # 描画用の画像（最初に描画するときに取得する）
+        self._image = None
+        
+    @property
+    def image(self):
+        """描画用の画像（シンプルな四角形。全ての敵で共有する）"""
+        image = self._image
+        if image is None:
+            # 画面が作成された後の最初の描画で取得し、以降はアトラスを引かない
+            image = self._image = solid_image(30, 30, (255, 0, 0))  # 赤色
+        return image
+        
+    def reset_position(self, x, y):
+        """位置と状態を初期状態に戻す
+        
+        Args:
+            x (int): リセット後のX座標
+            y (int): リセット後のY座標
+        """
+        self.rect.x = x
+        self.rect.y = y
+        self.float_x = float(x)
+        self.float_y = float(y)
+        self.state = self.ACTIVE
+        self.direction = self.DIRECTION_LEFT
+        
     def update(self, blocks):
         """敵の状態を更新
         
         Args:
-            blocks (pygame.sprite.Group): ブロックのグループ
+            blocks (SpatialGrid): ブロックの空間インデックス
         """
         if self.state == self.ACTIVE:
             # 通常状態では現在の方向に移動
+            start_rect = self.rect.copy()
             self.float_x += self.MOVE_SPEED * self.direction
             self.rect.x = int(self.float_x)
             
-            # ブロックとの衝突判定
-            block_hit_list = pygame.sprite.spritecollide(self, blocks, False)
-            for block in block_hit_list:
+            # ブロックとの衝突判定（通過した範囲で最も手前のブロックに合わせて方向転換）
+            block_hit_list = blocks.query(self.rect.union(start_rect))
+            if block_hit_list:
                 if self.direction == self.DIRECTION_LEFT:  # 左に移動中
-                    self.rect.left = block.rect.right
+                    self.rect.left = max(block.rect.right for block in block_hit_list)
                     self.direction = self.DIRECTION_RIGHT  # 方向転換
                 elif self.direction == self.DIRECTION_RIGHT:  # 右に移動中
-                    self.rect.right = block.rect.left
+                    self.rect.right = min(block.rect.left for block in block_hit_list)
                     self.direction = self.DIRECTION_LEFT  # 方向転換
                 self.float_x = float(self.rect.x)
                 
@@ -93,7 +115,7 @@ class Enemy(pygame.sprite.Sprite):
         Returns:
             int: 0=衝突なし, 1=上からの衝突（敵を倒せる）, 2=その他の衝突（ダメージ）
         """
-        if not pygame.sprite.collide_rect(self, player) or self.state == self.DEFEATED:
+        if not self.rect.colliderect(player.rect) or self.state == self.DEFEATED:
             return 0  # 衝突なし
             
         # プレイヤーが上から敵に接触したかどうか
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+軽量エンティティモジュール（ステージに大量に置くブロック・敵の基底クラスとグループ）
+"""
+
+
+class Entity:
+    """軽量エンティティの基底クラス
+    
+    pygame.sprite.Sprite の代わりに使う。__slots__ で属性を固定して __dict__ を持たず、
+    所属できるグループは1つだけにすることで、1体あたりのメモリと作成時間を抑える。
+    画像は描画するときに image 属性（サブクラスで定義）から取得する。
+    """
+    
+    __slots__ = ("rect", "group")
+    
+    def __init__(self, rect):
+        """初期化
+        
+        Args:
+            rect (pygame.Rect): 位置と大きさ
+        """
+        self.rect = rect
+        self.group = None  # 所属するグループ
+        
+    def kill(self):
+        """所属するグループから削除"""
+        if self.group is not None:
+            self.group.remove(self)
+            
+    def alive(self):
+        """グループに所属しているかどうか
+        
+        Returns:
+            bool: 所属していればTrue
+        """
+        return self.group is not None
+
+
+class EntityGroup:
+    """軽量エンティティのグループ
+    
+    pygame.sprite.Group と同じく追加した順に列挙する。
+    """
+    
+    def __init__(self):
+        """初期化"""
+        # エンティティ -> None（追加順を保つ集合として使う）
+        self._entities = {}
+        
+    def add(self, *entities):
+        """エンティティを追加（他のグループに所属している場合はそこから移す）
+        
+        Args:
+            *entities (Entity): 追加するエンティティ
+        """
+        for entity in entities:
+            if entity.group is self:
+                continue
+            if entity.group is not None:
+                entity.group.remove(entity)
+            entity.group = self
+            self._entities[entity] = None
+            
+    def remove(self, *entities):
+        """エンティティを削除
+        
+        Args:
+            *entities (Entity): 削除するエンティティ
+        """
+        for entity in entities:
+            if entity.group is self:
+                del self._entities[entity]
+                entity.group = None
+                
+    def empty(self):
+        """全てのエンティティを削除"""
+        for entity in self._entities:
+            entity.group = None
+        self._entities.clear()
+        
+    def update(self, *args):
+        """全てのエンティティの update を呼ぶ（更新中に削除されても全て呼ぶ）
+        
+        Args:
+            *args: update に渡す引数
+        """
+        for entity in list(self._entities):
+            entity.update(*args)
+            
+    def __contains__(self, entity):
+        return entity in self._entities
+        
+    def __iter__(self):
+        return iter(list(self._entities))
+        
+    def __len__(self):
+        return len(self._entities)
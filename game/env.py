@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+強化学習用の環境モジュール（Gym形式の reset / step）
+"""
+
+import numpy as np
+import pygame
+from game.enemy import Enemy
+from game.game_state import GameState
+from game.simulation import Simulation
+
+
+class GameEnv:
+    """ゲームを強化学習の環境として扱うクラス
+    
+    Gymnasium と同じ形式の reset() / step(action) を持ち、画面なしで Simulation を直接進める。
+    行動は Simulation の入力ビットの論理和（0〜15）。観測はNumPy配列の辞書で、
+    プレイヤーの周りの地形のタイル、プレイヤーの位置と速度、近くの敵の位置と速度を含む。
+    
+    報酬はゴールへの前進（それまでに到達した最も右の位置を超えた分）、敵を踏んだ回数、
+    残機を失った回数、ゴールから求める。リトライ画面では常にリトライを選び、
+    ゲームオーバーかゴールでエピソードを終了する。
+    """
+    
+    # 行動の数（入力ビットの組み合わせ）
+    ACTION_COUNT = 16
+    
+    # 観測する地形の列数（プレイヤーを中心とする。行数はステージの高さ全体）
+    VIEW_COLS = 16
+    
+    # 観測する敵の最大数（プレイヤーに近い順）
+    MAX_ENEMIES = 8
+    
+    # プレイヤーの観測値の列
+    PLAYER_X = 0          # X座標
+    PLAYER_Y = 1          # Y座標
+    PLAYER_VEL_X = 2      # X方向の速度
+    PLAYER_VEL_Y = 3      # Y方向の速度
+    PLAYER_STATE = 4      # 状態（Player.STANDING など）
+    PLAYER_GOAL_DX = 5    # ゴールまでのX方向の距離
+    PLAYER_SIZE = 6
+    
+    # 敵の観測値の列
+    ENEMY_DX = 0       # プレイヤーから見たX座標
+    ENEMY_DY = 1       # プレイヤーから見たY座標
+    ENEMY_VEL_X = 2    # X方向の速度（観測する敵は地面を歩くだけなので、Y方向の速度は常に0のため持たない）
+    ENEMY_PRESENT = 3  # 敵がいれば1（空きの行は全て0）
+    ENEMY_SIZE = 4
+    
+    # 報酬
+    PROGRESS_REWARD = 0.01    # 前進1ピクセルあたり
+    STOMP_REWARD = 1.0        # 敵を踏んで倒した
+    LOSE_LIFE_REWARD = -5.0   # 残機を失った
+    CLEAR_REWARD = 10.0       # ゴールした
+    
+    def __init__(self, level=None, max_steps=3600, frame_skip=1, screen_width=800, screen_height=600):
+        """初期化
+        
+        Args:
+            level (str): レベル名またはJSONファイルのパス（Noneなら標準のレベル）
+            max_steps (int): 1エピソードの最大ステップ数（超えたら truncated）
+            frame_skip (int): 1ステップで同じ行動を繰り返すティック数
+            screen_width (int): 画面の幅（カメラと敵のLODの計算に使う）
+            screen_height (int): 画面の高さ（落下判定に使う）
+        """
+        self.max_steps = max_steps
+        self.frame_skip = frame_skip
+        self.simulation = Simulation(screen_width, screen_height, level=level)
+        stage = self.simulation.stage
+        
+        # 地形のタイル（左右に観測する列数の半分だけ空きを足しておき、切り出すだけで観測にする）
+        size = stage.TILE_SIZE
+        self.tile_size = size
+        self._pad = self.VIEW_COLS // 2
+        rows = -(-stage.height // size)
+        cols = -(-stage.width // size)
+        self.tiles = np.zeros((rows, cols + self._pad * 2), dtype=np.uint8)
+        for block in stage.blocks:
+            rect = block.rect
+            col0 = max(rect.left // size, 0)
+            col1 = min(-(-rect.right // size), cols)
+            row0 = max(rect.top // size, 0)
+            row1 = min(-(-rect.bottom // size), rows)
+            self.tiles[row0:row1, col0 + self._pad:col1 + self._pad] = 1
+            
+        # エピソードの状態
+        self.steps = 0
+        self._best_x = 0
+        
+    @property
+    def observation_shapes(self):
+        """観測値の配列の形（キー -> shape）"""
+        return {
+            "tiles": (self.tiles.shape[0], self.VIEW_COLS),
+            "player": (self.PLAYER_SIZE,),
+            "enemies": (self.MAX_ENEMIES, self.ENEMY_SIZE),
+        }
+        
+    def reset(self, seed=None):
+        """エピソードを始める（ステージは作り直さず初期状態に戻す）
+        
+        Args:
+            seed (int): 使わない（ゲームは決定的。Gym形式に合わせるための引数）
+            
+        Returns:
+            tuple: (観測, 情報の辞書)
+        """
+        simulation = self.simulation
+        simulation.game_state.start_game()
+        simulation.reset_stage()
+        self.steps = 0
+        self._best_x = simulation.player.rect.x
+        return self._observe(), self._info()
+        
+    def step(self, action):
+        """行動を与えて frame_skip ティック進める
+        
+        Args:
+            action (int): 入力ビットの論理和（Simulation.INPUT_*）
+            
+        Returns:
+            tuple: (観測, 報酬, 終了したかどうか, 打ち切ったかどうか, 情報の辞書)
+        """
+        simulation = self.simulation
+        game_state = simulation.game_state
+        reward = 0.0
+        
+        for _ in range(self.frame_skip):
+            state = simulation.step(action)
+            for event in simulation.events:
+                if event == Simulation.EVENT_STOMP:
+                    reward += self.STOMP_REWARD
+                elif event == Simulation.EVENT_LOSE_LIFE:
+                    reward += self.LOSE_LIFE_REWARD
+                elif event == Simulation.EVENT_CLEAR:
+                    reward += self.CLEAR_REWARD
+                    
+            # ゴールへの前進（それまでに到達した位置より右に進んだ分だけ）
+            x = simulation.player.rect.x
+            if x > self._best_x:
+                reward += (x - self._best_x) * self.PROGRESS_REWARD
+                self._best_x = x
+                
+            if state == GameState.RETRY:
+                # 常にリトライを選び、最初から再開する
+                game_state.select_retry(0)
+                game_state.confirm_retry()
+                simulation.reset_stage()
+            elif state == GameState.RESULT:
+                break
+                
+        self.steps += 1
+        terminated = game_state.state == GameState.RESULT
+        truncated = not terminated and self.steps >= self.max_steps
+        return self._observe(), reward, terminated, truncated, self._info()
+        
+    def _observe(self):
+        """観測値を作成
+        
+        Returns:
+            dict: "tiles"（uint8、1ならブロック）、"player"、"enemies"（float32）の配列
+        """
+        player = self.simulation.player
+        rect = player.rect
+        
+        # プレイヤーを中心とした地形のタイル
+        col = rect.centerx // self.tile_size
+        col = min(max(col, 0), self.tiles.shape[1] - self.VIEW_COLS)
+        tiles = self.tiles[:, col:col + self.VIEW_COLS].copy()
+        
+        goal = self.simulation.stage.goal
+        goal_dx = goal.rect.x - rect.x if goal is not None else 0
+        player_obs = np.array((rect.x, rect.y, player.vel_x, player.vel_y, player.state, goal_dx),
+                              dtype=np.float32)
+                              
+        # 観測するタイルの範囲にいる倒されていない敵（プレイヤーに近い順）
+        half = self._pad * self.tile_size
+        window = pygame.Rect(rect.centerx - half, 0, half * 2, self.simulation.stage.height)
+        enemies = [enemy for enemy in self.simulation.stage.enemy_broadphase.query(window)
+                   if enemy.state == Enemy.ACTIVE]
+        enemies.sort(key=lambda enemy: abs(enemy.rect.x - rect.x))
+        enemy_obs = np.zeros((self.MAX_ENEMIES, self.ENEMY_SIZE), dtype=np.float32)
+        for i, enemy in enumerate(enemies[:self.MAX_ENEMIES]):
+            enemy_obs[i] = (enemy.rect.x - rect.x, enemy.rect.y - rect.y,
+                            Enemy.MOVE_SPEED * enemy.direction, 1)
+                            
+        return {"tiles": tiles, "player": player_obs, "enemies": enemy_obs}
+        
+    def _info(self):
+        """情報の辞書を作成
+        
+        Returns:
+            dict: 残機、クリアしたかどうか、経過ティック数
+        """
+        game_state = self.simulation.game_state
+        return {"lives": game_state.lives, "cleared": game_state.is_cleared, "frame": self.simulation.frame}
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ステージ自動生成モジュール
+"""
+
+import heapq
+import json
+import os
+import random
+import pygame
+from game.level import LEVEL_DIR, SOLID_TILE, load_level
+from game.player import Player
+from game.spatial import SpatialGrid
+
+# 生成処理のバージョン（生成・検証の内容を変えたら上げる。キャッシュのキーに含める）
+GENERATOR_VERSION = 1
+
+# 生成したレベルの保存先
+CACHE_DIR = os.path.join(LEVEL_DIR, "__pycache__", "generated")
+
+
+class _Solid:
+    """検証用のブロック（矩形だけを持つ）"""
+    
+    __slots__ = ("rect",)
+    
+    def __init__(self, rect):
+        self.rect = rect
+
+
+class StageGenerator:
+    """シード付きのステージ生成クラス
+    
+    地面の区間（穴で区切られた地面と、その上の障害物）を左から1つずつ乱数で作り、
+    Player と同じ物理パラメータで直前の区間から渡れるかを検証する。
+    渡れない区間はその区間だけを作り直すため、長いステージでも生成時間は長さに比例する。
+    """
+    
+    # 地面の高さ（Y座標）とタイルの一辺の長さ
+    GROUND_Y = 500
+    TILE_SIZE = 50
+    HEIGHT = 600
+    
+    # 地面の区間の長さ（タイル数）と穴の幅（タイル数）
+    GROUND_TILES = (6, 20)
+    GAP_TILES = (2, 3, 4)
+    
+    # 障害物の高さと、地面のタイルに障害物を置く割合
+    OBSTACLE_HEIGHTS = (100, 150)
+    OBSTACLE_RATE = 0.08
+    
+    # 敵を置く間隔の目安（ピクセル）
+    ENEMY_SPACING = 700
+    
+    # 中間地点の最小間隔（ピクセル）
+    CHECKPOINT_SPACING = 1000
+    
+    # スタート地点とゴール地点の平らな地面の長さ（タイル数）
+    START_TILES = 10
+    GOAL_TILES = 10
+    
+    # 1つの区間を作り直す最大回数
+    MAX_ATTEMPTS = 100
+    
+    # 検証で試す操作: 助走のティック数、ジャンプ後に右を押し続けるティック数（Noneなら着地まで）
+    RUN_UP_TICKS = range(0, 48, 4)
+    AIR_HOLD_TICKS = (None, 16, 8)
+    
+    # 1回のジャンプの最大ティック数
+    AIR_TICKS = 120
+    
+    # 検証で同じ位置とみなす横方向の幅（ピクセル）
+    VISIT_CELL = 10
+    
+    # 次の区間の検証を始める着地位置の最大数
+    MAX_ENTRIES = 3
+    
+    def __init__(self, seed, length=3000):
+        """初期化
+        
+        Args:
+            seed (int): 乱数のシード
+            length (int): ステージの幅（ピクセル、タイルサイズの倍数）
+        """
+        self.seed = seed
+        self.length = length
+        
+    def generate(self):
+        """到達可能なステージを生成
+        
+        Returns:
+            dict: レベルデータ（レベルファイルのJSONと同じ形式）
+            
+        Raises:
+            RuntimeError: MAX_ATTEMPTS 回作り直しても渡れる区間が作れなかった場合
+        """
+        rng = random.Random(self.seed)
+        tile = self.TILE_SIZE
+        cols = self.length // tile
+        ground_row = self.GROUND_Y // tile
+        rows = [["."] * cols for _ in range(self.HEIGHT // tile)]
+        grid = SpatialGrid()
+        start = (100, 400)
+        goal = pygame.Rect(self.length - 200, self.GROUND_Y - 80, 50, 80)
+        
+        # スタート地点の地面に着地した状態から始める
+        segments = [(0, self.START_TILES, {})]
+        self._add_segment(grid, segments[0])
+        player = Player(*start)
+        if not self._fall(player, grid):
+            raise RuntimeError(f"スタート位置に地面がありません（シード: {self.seed}）")
+        entries = [self._save(player)]
+        
+        end = self.START_TILES
+        while end < cols:
+            for _ in range(self.MAX_ATTEMPTS):
+                segment = self._segment(rng, end, cols)
+                solids = self._add_segment(grid, segment)
+                # 穴を渡って区間に着地でき、区間の障害物をすべて越えられるか
+                landings = self._search(player, grid, entries, segment[0] * tile)
+                if landings and segment[2]:
+                    last_obstacle = (max(segment[2]) + 1) * tile
+                    landings = self._search(player, grid, landings, last_obstacle + player.rect.width - 1)
+                if landings:
+                    break
+                for solid in solids:
+                    grid.remove(solid)
+            else:
+                raise RuntimeError(f"渡れる区間を生成できませんでした（シード: {self.seed}, X: {end * tile}）")
+            segments.append(segment)
+            entries = landings
+            end = segment[1]
+            
+        # 最後の区間からゴールまで進めるか
+        if not self._search(player, grid, entries, None, goal):
+            raise RuntimeError(f"ゴールに到達できません（シード: {self.seed}）")
+            
+        # タイル
+        for seg_start, seg_end, obstacles in segments:
+            for col in range(seg_start, seg_end):
+                rows[ground_row][col] = SOLID_TILE
+            for col, height in obstacles.items():
+                for row in range(ground_row - height // tile, ground_row):
+                    rows[row][col] = SOLID_TILE
+                    
+        # 敵（地面があり障害物の無いタイルに置く。検証では踏むか飛び越えられるものとして扱う）
+        candidates = [col for seg_start, seg_end, obstacles in segments[1:]
+                      for col in range(seg_start + 1, seg_end - 1)
+                      if col not in obstacles and col < cols - self.GOAL_TILES]
+        enemies = []
+        if candidates:
+            for _ in range(self.length // self.ENEMY_SPACING):
+                col = rng.choice(candidates)
+                enemies.append([col * tile + 10, self.GROUND_Y - 30])
+        enemies.sort()
+        
+        # 中間地点（区間の始まりを一定間隔以上空けて選ぶ）
+        checkpoints = []
+        for seg_start, _, _ in segments[1:-1]:
+            previous = checkpoints[-1] if checkpoints else 0
+            if seg_start * tile - previous >= self.CHECKPOINT_SPACING:
+                checkpoints.append(seg_start * tile)
+                
+        return {
+            "width": self.length,
+            "height": self.HEIGHT,
+            "tile_size": tile,
+            "start": list(start),
+            "goal": [goal.x, goal.y],
+            "checkpoints": checkpoints,
+            "enemies": enemies,
+            "tiles": ["".join(row) for row in rows],
+        }
+        
+    def _segment(self, rng, previous_end, cols):
+        """穴とその先の地面の区間を1つ作成
+        
+        Args:
+            rng (random.Random): 乱数
+            previous_end (int): 直前の区間の終了列
+            cols (int): ステージの列数
+            
+        Returns:
+            tuple: (開始列, 終了列, {障害物の列: 高さ})
+        """
+        start = previous_end + rng.choice(self.GAP_TILES)
+        end = start + rng.randint(*self.GROUND_TILES)
+        
+        # ゴール地点の平らな地面までつながる場合は最後の区間にする
+        if end + self.GAP_TILES[-1] + self.GROUND_TILES[0] > cols - self.GOAL_TILES:
+            return (min(start, cols - self.GOAL_TILES), cols, {})
+            
+        # 障害物（区間の端から2タイル以内には置かない）
+        obstacles = {}
+        for col in range(start + 2, end - 2):
+            if rng.random() < self.OBSTACLE_RATE:
+                obstacles[col] = rng.choice(self.OBSTACLE_HEIGHTS)
+        return (start, end, obstacles)
+        
+    def _add_segment(self, grid, segment):
+        """区間の地面と障害物を検証用の空間インデックスに登録
+        
+        Args:
+            grid (SpatialGrid): 検証用の空間インデックス
+            segment (tuple): (開始列, 終了列, {障害物の列: 高さ})
+            
+        Returns:
+            list: 登録したブロック
+        """
+        tile = self.TILE_SIZE
+        start, end, obstacles = segment
+        solids = [_Solid(pygame.Rect(start * tile, self.GROUND_Y, (end - start) * tile, tile))]
+        for col, height in obstacles.items():
+            solids.append(_Solid(pygame.Rect(col * tile, self.GROUND_Y - height, tile, height)))
+        for solid in solids:
+            grid.add(solid)
+        return solids
+        
+    def _search(self, player, grid, entries, boundary, goal=None):
+        """着地した位置から、次の区間（またはゴール）へ進めるかを探索
+        
+        立っている状態から助走とダッシュジャンプの組み合わせを試し、
+        現在の区間に着地した状態は右にあるものから順にさらに探索する。
+        
+        Args:
+            player (Player): 検証に使うプレイヤー
+            grid (SpatialGrid): 検証用の空間インデックス
+            entries (list): 探索を始める立っている状態
+            boundary (int): プレイヤーの右端がこれを超えた位置に着地したら到達とするX座標
+                （次の区間の左端など。ゴールを探す場合はNone）
+            goal (pygame.Rect): ゴールの矩形（区間を探す場合はNone）
+            
+        Returns:
+            list: boundary を超えて着地した状態（最大 MAX_ENTRIES 個。ゴールを探す場合は到達できれば [True]）
+        """
+        frontier = [(-state[0], state) for state in entries]
+        heapq.heapify(frontier)
+        visited = {self._visit_key(state) for state in entries}
+        while frontier:
+            _, origin = heapq.heappop(frontier)
+            landings = {}
+            for run_up in self.RUN_UP_TICKS:
+                for hold in self.AIR_HOLD_TICKS:
+                    self._load(player, origin)
+                    result = self._try_jump(player, grid, run_up, hold, goal)
+                    if result is True:
+                        return [True]
+                    if result is None:
+                        continue
+                    key = self._visit_key(result)
+                    if boundary is not None and result[0] + player.rect.width > boundary:
+                        landings.setdefault(key, result)
+                    elif key not in visited:
+                        visited.add(key)
+                        heapq.heappush(frontier, (-result[0], result))
+            if landings:
+                # 助走に使えるよう、次の区間の左寄りの着地位置を残す
+                return sorted(landings.values())[:self.MAX_ENTRIES]
+        return []
+        
+    def _try_jump(self, player, grid, run_up, hold, goal):
+        """助走してからダッシュジャンプし、着地した状態を返す
+        
+        Args:
+            player (Player): 立っている状態のプレイヤー
+            grid (SpatialGrid): 検証用の空間インデックス
+            run_up (int): ジャンプまでの助走のティック数
+            hold (int): ジャンプ後に右を押し続けるティック数（Noneなら着地まで）
+            goal (pygame.Rect): ゴールの矩形（Noneなら判定しない）
+            
+        Returns:
+            object: ゴールに着いたらTrue、着地したら着地時の状態、落ちたらNone
+        """
+        for tick in range(run_up + self.AIR_TICKS):
+            # Simulation.step と同じ順で入力を与える
+            if tick < run_up or hold is None or tick - run_up < hold:
+                player.move_right(True)
+            else:
+                player.stop()
+            if tick == run_up:
+                player.jump()
+            player.update(grid)
+            if goal is not None and player.rect.colliderect(goal):
+                return True
+            if player.rect.y > self.HEIGHT:
+                return None
+            if tick > run_up and player.state == Player.STANDING:
+                return self._save(player)
+        return None
+        
+    def _fall(self, player, grid):
+        """その場で着地するまで落下させる
+        
+        Args:
+            player (Player): プレイヤー
+            grid (SpatialGrid): 検証用の空間インデックス
+            
+        Returns:
+            bool: 着地できればTrue
+        """
+        for _ in range(self.AIR_TICKS):
+            player.stop()
+            player.update(grid)
+            if player.state == Player.STANDING:
+                return True
+            if player.rect.y > self.HEIGHT:
+                return False
+        return False
+        
+    def _visit_key(self, state):
+        """探索済みの判定に使うキー（X座標は VISIT_CELL ごとにまとめる）"""
+        return (state[0] // self.VISIT_CELL, state[1])
+        
+    @staticmethod
+    def _save(player):
+        """検証用にプレイヤーの状態を記録（X座標を先頭にする）"""
+        return (player.rect.x, player.rect.y, player.float_x, player.float_y,
+                player.vel_x, player.vel_y, player.state)
+                
+    @staticmethod
+    def _load(player, state):
+        """検証用に記録した状態に戻す"""
+        (player.rect.x, player.rect.y, player.float_x, player.float_y,
+         player.vel_x, player.vel_y, player.state) = state
+
+
+def generated_level_path(seed, length=3000):
+    """生成したステージのJSONファイルのパスを取得（無ければ生成して保存する）
+    
+    生成と検証は時間がかかるため、シード・幅・生成処理のバージョンごとにファイルへ保存して再利用する。
+    
+    Args:
+        seed (int): 乱数のシード
+        length (int): ステージの幅
+        
+    Returns:
+        str: JSONファイルのパス
+    """
+    path = os.path.join(CACHE_DIR, f"seed{seed}-w{length}-v{GENERATOR_VERSION}.json")
+    if not os.path.exists(path):
+        data = StageGenerator(seed, length).generate()
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temporary, path)
+    return path
+
+
+def load_generated_level(seed, length=3000):
+    """生成したステージを読み込む
+    
+    Args:
+        seed (int): 乱数のシード
+        length (int): ステージの幅
+        
+    Returns:
+        Level: レベルデータ
+    """
+    return load_level(generated_level_path(seed, length))
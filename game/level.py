@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+レベルデータモジュール（JSON形式のレベルの読み込みとバイナリキャッシュ）
+"""
+
+from array import array
+import json
+import mmap
+import os
+import struct
+from game.tilemap import TileMap
+
+# レベルファイルの置き場所
+LEVEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "levels")
+
+# コンパイル済みファイルの形式
+#   ヘッダ: マジック, バージョン, フラグ, 幅, 高さ, タイルサイズ, スタート位置, ゴール位置,
+#           ブロック数, 敵の数, 中間地点の数, 元ファイルのサイズと更新時刻
+#   本体: ブロックの矩形 (x, y, w, h), 敵の位置 (x, y), 中間地点のX座標（いずれもint32）
+MAGIC = b"SCBL"
+VERSION = 1
+_HEADER = struct.Struct("<4sBBxxIIIiiiiIIIQQ")
+
+# フラグ
+FLAG_GOAL = 0x01  # ゴールがある
+
+# タイルの文字（tiles の各行で使用）
+SOLID_TILE = "#"
+
+# 読み込み済みのレベル（元ファイルのパスごと）
+_loaded = {}
+
+
+def level_path(name):
+    """レベル名からJSONファイルのパスを取得
+    
+    Args:
+        name (str): レベル名（levels ディレクトリ内のファイル名）またはJSONファイルのパス
+        
+    Returns:
+        str: JSONファイルの絶対パス
+    """
+    if name.endswith(".json") or os.sep in name:
+        return os.path.abspath(name)
+    return os.path.join(LEVEL_DIR, name + ".json")
+
+
+def cache_path(source):
+    """JSONファイルに対応するコンパイル済みファイルのパス
+    
+    Args:
+        source (str): JSONファイルのパス
+        
+    Returns:
+        str: コンパイル済みファイルのパス（同じディレクトリの __pycache__ 内）
+    """
+    directory, filename = os.path.split(source)
+    return os.path.join(directory, "__pycache__", os.path.splitext(filename)[0] + ".scbl")
+
+
+def compile_level(source, target=None):
+    """JSONファイルのレベルをバイナリ形式にコンパイル
+    
+    JSONファイルの形式:
+        width, height, tile_size: ステージの大きさとタイルの一辺の長さ（ピクセル）
+        tiles: 上から順の行の文字列（"#" がブロック、それ以外は空白）
+        start: [x, y] スタート位置
+        goal: [x, y] ゴールの位置（省略可）
+        enemies: [[x, y], ...] 敵の初期位置（この順に作成する）
+        checkpoints: [x, ...] 中間地点のX座標（省略可）
+        
+    Args:
+        source (str): JSONファイルのパス
+        target (str): 出力先のパス（Noneなら cache_path(source)）
+        
+    Returns:
+        str: 出力先のパス
+        
+    Raises:
+        ValueError: 形式が正しくない場合
+    """
+    if target is None:
+        target = cache_path(source)
+        
+    with open(source, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    try:
+        width = int(data["width"])
+        height = int(data["height"])
+        tile_size = int(data.get("tile_size", 50))
+        start_x, start_y = (int(v) for v in data["start"])
+        tiles = data["tiles"]
+        enemies = [(int(x), int(y)) for x, y in data.get("enemies", ())]
+        checkpoints = [int(x) for x in data.get("checkpoints", ())]
+        goal = data.get("goal")
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"レベルファイルの形式が正しくありません: {source}: {e}") from e
+        
+    # タイルを連続区間にまとめ、ブロックの矩形にする
+    tilemap = TileMap(width, height, tile_size)
+    if len(tiles) > tilemap.rows:
+        raise ValueError(f"レベルファイルの行数が高さを超えています: {source}")
+    for row, line in enumerate(tiles):
+        col = 0
+        while col < len(line):
+            if line[col] != SOLID_TILE:
+                col += 1
+                continue
+            end = col
+            while end < len(line) and line[end] == SOLID_TILE:
+                end += 1
+            tilemap.fill_rect(col * tile_size, row * tile_size, (end - col) * tile_size, tile_size)
+            col = end
+            
+    rects = array("i")
+    for rect in tilemap.rects():
+        rects.extend((rect.x, rect.y, rect.width, rect.height))
+        
+    flags = 0
+    goal_x = goal_y = 0
+    if goal is not None:
+        flags |= FLAG_GOAL
+        goal_x, goal_y = (int(v) for v in goal)
+        
+    stat = os.stat(source)
+    header = _HEADER.pack(MAGIC, VERSION, flags, width, height, tile_size,
+                          start_x, start_y, goal_x, goal_y,
+                          len(rects) // 4, len(enemies), len(checkpoints),
+                          stat.st_size, stat.st_mtime_ns)
+    
+    # 書き込み途中のファイルを読まないよう、一時ファイルに書いてから置き換える
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    temporary = f"{target}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(header)
+        f.write(rects.tobytes())
+        f.write(array("i", (v for enemy in enemies for v in enemy)).tobytes())
+        f.write(array("i", checkpoints).tobytes())
+    os.replace(temporary, target)
+    return target
+
+
+def load_level(name):
+    """レベルを読み込む
+    
+    コンパイル済みファイルが無いか古い場合、または読み込めない場合（形式のバージョンが違う、
+    書き込み途中で壊れているなど）はコンパイルし直してから読み込む。
+    同じレベルは読み込み済みのものを再利用する。
+    
+    Args:
+        name (str): レベル名またはJSONファイルのパス
+        
+    Returns:
+        Level: レベルデータ
+    """
+    source = level_path(name)
+    stat = os.stat(source)
+    level = _loaded.get(source)
+    if level is not None and level.is_current(stat):
+        return level
+        
+    target = cache_path(source)
+    level = None
+    if os.path.exists(target):
+        try:
+            level = Level(target)
+        except (ValueError, OSError):
+            level = None
+        if level is not None and not level.is_current(stat):
+            level.close()
+            level = None
+    if level is None:
+        level = Level(compile_level(source, target))
+        
+    _loaded[source] = level
+    return level
+
+
+class Level:
+    """コンパイル済みのレベルデータ
+    
+    ファイルをメモリマップし、ブロック・敵・中間地点の配列はコピーせずに
+    memoryview として参照する。
+    """
+    
+    def __init__(self, path):
+        """初期化
+        
+        Args:
+            path (str): コンパイル済みファイルのパス
+            
+        Raises:
+            ValueError: 形式が正しくない場合
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        
+        if len(view) < _HEADER.size:
+            raise ValueError(f"レベルファイルが短すぎます: {path}")
+        (magic, version, flags, self.width, self.height, self.tile_size,
+         start_x, start_y, goal_x, goal_y, run_count, enemy_count, checkpoint_count,
+         self.source_size, self.source_mtime_ns) = _HEADER.unpack_from(view)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"レベルファイルの形式が正しくありません: {path}")
+            
+        self.start = (start_x, start_y)
+        self.goal = (goal_x, goal_y) if flags & FLAG_GOAL else None
+        
+        # 本体をint32の配列として参照
+        values = view[_HEADER.size:].cast("i")
+        if len(values) != run_count * 4 + enemy_count * 2 + checkpoint_count:
+            raise ValueError(f"レベルファイルの大きさが一致しません: {path}")
+        self.rects = values[:run_count * 4]
+        self.enemies = values[run_count * 4:run_count * 4 + enemy_count * 2]
+        self.checkpoints = values[run_count * 4 + enemy_count * 2:]
+        
+    def is_current(self, stat):
+        """元のJSONファイルから作り直す必要がないかどうか
+        
+        Args:
+            stat (os.stat_result): 元のJSONファイルの情報
+            
+        Returns:
+            bool: 元ファイルのサイズと更新時刻が一致すればTrue
+        """
+        return self.source_size == stat.st_size and self.source_mtime_ns == stat.st_mtime_ns
+        
+    def iter_rects(self):
+        """ブロックの矩形を順に取得
+        
+        Returns:
+            iterator: (x, y, width, height) のイテレータ
+        """
+        rects = self.rects
+        return (tuple(rects[i:i + 4]) for i in range(0, len(rects), 4))
+        
+    def iter_enemies(self):
+        """敵の初期位置を順に取得
+        
+        Returns:
+            iterator: (x, y) のイテレータ
+        """
+        enemies = self.enemies
+        return ((enemies[i], enemies[i + 1]) for i in range(0, len(enemies), 2))
+        
+    def close(self):
+        """メモリマップを閉じる"""
+        self.rects = self.enemies = self.checkpoints = None
+        self._map.close()
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+敵のシミュレーション詳細度（LOD）モジュール
+"""
+
+import pygame
+from game.enemy import Enemy
+from game.spatial import SpatialGrid
+
+
+class _Sleeper:
+    """眠っている敵の移動を計算するためのデータ
+    
+    眠っている敵は左右の壁の間を一定速度で往復するだけなので、
+    眠り始めた時点の位置・方向と経過ティック数から現在の位置を計算できる。
+    作成後は変更しないため、スナップショットからそのまま参照できる。
+    """
+    
+    __slots__ = ("enemy", "tick", "x", "y", "direction", "left", "right", "rect")
+    
+    def __init__(self, enemy, tick, left, right):
+        """初期化
+        
+        Args:
+            enemy (Enemy): 対象の敵
+            tick (int): 眠り始めたティック
+            left (int): 移動範囲の左端（敵のX座標の最小値）
+            right (int): 移動範囲の右端（敵のX座標の最大値）
+        """
+        self.enemy = enemy
+        self.tick = tick
+        self.x = enemy.rect.x
+        self.y = enemy.rect.y
+        self.direction = enemy.direction
+        self.left = left
+        self.right = right
+        
+        # 移動範囲（空間インデックスに登録する。X方向だけを使う）
+        self.rect = pygame.Rect(left, 0, right + enemy.rect.width - left, 1)
+        
+    def position(self, tick):
+        """指定したティックでの位置と方向を計算
+        
+        Enemy.update と同じ結果になるよう、壁に当たったティックでは壁に接する位置へ戻して向きを変える。
+        
+        Args:
+            tick (int): ティック
+            
+        Returns:
+            tuple: (X座標, 方向)
+        """
+        n = tick - self.tick
+        x = self.x
+        left = self.left
+        right = self.right
+        speed = Enemy.MOVE_SPEED
+        
+        # 最初に壁に当たるまで
+        if self.direction == Enemy.DIRECTION_RIGHT:
+            first = (right - x) // speed + 1
+            if n < first:
+                return x + speed * n, Enemy.DIRECTION_RIGHT
+            phase_offset = None
+        else:
+            first = (x - left) // speed + 1
+            if n < first:
+                return x - speed * n, Enemy.DIRECTION_LEFT
+            phase_offset = 0
+            
+        # 以降は左端から右端まで half ティック、右端から左端まで half ティックの周期で往復する
+        half = (right - left) // speed + 1
+        if phase_offset is None:
+            phase_offset = half  # 右端で左向きになったところ
+        phase = (phase_offset + n - first) % (half * 2)
+        if phase < half:
+            return left + speed * phase, Enemy.DIRECTION_RIGHT
+        return right - speed * (phase - half), Enemy.DIRECTION_LEFT
+        
+    def advance(self, tick):
+        """指定したティックでの位置と方向を敵に反映する
+        
+        Args:
+            tick (int): ティック
+        """
+        x, direction = self.position(tick)
+        enemy = self.enemy
+        enemy.rect.x = x
+        enemy.float_x = float(x)
+        enemy.direction = direction
+        
+    def restore(self, tick):
+        """眠り始めた時点の状態に戻してから、指定したティックでの位置を反映する
+        
+        Args:
+            tick (int): ティック
+        """
+        enemy = self.enemy
+        enemy.rect.y = self.y
+        enemy.float_y = float(self.y)
+        enemy.state = Enemy.ACTIVE
+        self.advance(tick)
+
+
+class EnemyLOD:
+    """画面から離れた敵の更新を省略するクラス
+    
+    画面（とプレイヤー）から margin 以上離れた敵は眠らせ、毎フレームの衝突判定を行わない。
+    眠っている敵の位置は左右の壁の間の往復として計算で求め、移動範囲が画面に近づいたときだけ
+    位置を反映し、画面の近くに入ったら通常の更新に戻す。計算結果は通常の更新と一致するため、
+    プレイヤーから見た動きは変わらない。
+    
+    倒された敵、壁の無い方向へ進み続ける敵、ブロックと重なっている敵など、
+    往復として計算できない敵は常に通常の更新を行う。
+    ステージのブロックは変化しないものとする。
+    """
+    
+    # 眠っている敵の移動範囲を登録する空間インデックスのセルサイズ
+    CELL_SIZE = 400
+    
+    # 壁を探すときに一度に調べる幅
+    WALL_SEARCH_STEP = 800
+    
+    def __init__(self, stage, view_width, margin):
+        """初期化
+        
+        Args:
+            stage (Stage): 対象のステージ
+            view_width (int): 画面の幅
+            margin (int): 画面端から敵を眠らせるまでの距離（ピクセル）
+        """
+        self.stage = stage
+        self.view_width = view_width
+        self.margin = margin
+        
+        # 経過ティック数（眠っている敵の位置の計算に使う）
+        self.tick = 0
+        
+        # 通常の更新を行う敵（順序付きの集合として使う）
+        self.awake = {}
+        
+        # 眠っている敵 -> _Sleeper と、その移動範囲の空間インデックス
+        # sleepers はスナップショットと共有している間は変更せず、変更するときに複製する
+        self.sleepers = {}
+        self._sleepers_shared = False
+        self.sleeper_grid = SpatialGrid(self.CELL_SIZE)
+        
+        # 敵 -> 移動範囲 (left, right)（往復として計算できない敵はNone）
+        self._patrols = {}
+        
+        self.wake_all()
+        
+    def wake_all(self):
+        """全ての敵を通常の更新に戻す（ステージのリセットや状態の復元の後に呼ぶ）"""
+        self.awake = dict.fromkeys(self.stage.enemies)
+        self.sleepers = {}
+        self._sleepers_shared = False
+        self.sleeper_grid.clear()
+        
+    def sync(self, camera_offset_x=None, focus_rect=None):
+        """眠っている敵の位置を現在のティックに合わせる（敵の位置を読み出す前に呼ぶ）
+        
+        Args:
+            camera_offset_x (int): カメラのXオフセット（Noneなら全ての眠っている敵）
+            focus_rect (pygame.Rect): 画面外でも合わせる範囲
+            
+        Returns:
+            list: 位置を反映した敵のリスト
+        """
+        if camera_offset_x is None:
+            sleepers = self.sleepers.values()
+        else:
+            sleepers = self.sleeper_grid.query(self._window(camera_offset_x, focus_rect))
+        moved = []
+        for sleeper in sleepers:
+            sleeper.advance(self.tick)
+            moved.append(sleeper.enemy)
+        return moved
+        
+    def capture(self):
+        """現在の状態を記録（眠っている敵は起こさず、位置も計算しない）
+        
+        眠っている敵の辞書は次に変更されるまでスナップショットと共有するため、
+        敵が眠ったり起きたりしない間は何度記録しても複製しない。
+        
+        Returns:
+            tuple: (ティック, 起きている敵のタプル, 眠っている敵の辞書)
+        """
+        self._sleepers_shared = True
+        return self.tick, tuple(self.awake), self.sleepers
+        
+    def restore(self, tick, awake, sleepers, camera_offset_x, focus_rect=None):
+        """capture() で記録した状態に戻す
+        
+        眠っている敵は現在との差分だけを入れ替える。起きている敵の状態は呼び出し側で戻しておくこと。
+        
+        Args:
+            tick (int): 記録したティック
+            awake (tuple): 記録したときに起きていた敵
+            sleepers (dict): 記録したときに眠っていた敵の辞書
+            camera_offset_x (int): 戻した後のカメラのXオフセット
+            focus_rect (pygame.Rect): 画面外でも敵を起こしておく範囲
+            
+        Returns:
+            list: 位置を反映した眠っている敵のリスト
+        """
+        self.tick = tick
+        self.awake = dict.fromkeys(awake)
+        moved = []
+        
+        current = self.sleepers
+        if sleepers is not current:
+            for _, sleeper in current.items() - sleepers.items():
+                self.sleeper_grid.remove(sleeper)
+            for enemy, sleeper in sleepers.items() - current.items():
+                self.sleeper_grid.add(sleeper)
+                sleeper.restore(tick)
+                moved.append(enemy)
+            self.sleepers = sleepers
+        self._sleepers_shared = True
+        
+        # 画面の近くを移動範囲に含む敵は、戻したティックの位置に合わせる
+        return moved + self.sync(camera_offset_x, focus_rect)
+        
+    def _window(self, camera_offset_x, focus_rect):
+        """敵を起こしておく範囲を取得
+        
+        Args:
+            camera_offset_x (int): カメラのXオフセット
+            focus_rect (pygame.Rect): 画面外でも敵を起こしておく範囲
+            
+        Returns:
+            pygame.Rect: 範囲（X方向だけを使う）
+        """
+        left = camera_offset_x - self.margin
+        right = camera_offset_x + self.view_width + self.margin
+        if focus_rect is not None:
+            left = min(left, focus_rect.left - self.margin)
+            right = max(right, focus_rect.right + self.margin)
+        return pygame.Rect(left, 0, right - left, 1)
+        
+    def _own_sleepers(self):
+        """眠っている敵の辞書を変更する前に、スナップショットと共有していれば複製する"""
+        if self._sleepers_shared:
+            self.sleepers = dict(self.sleepers)
+            self._sleepers_shared = False
+            
+    def update(self, camera_offset_x, focus_rect=None):
+        """敵の状態を更新
+        
+        Args:
+            camera_offset_x (int): カメラのXオフセット
+            focus_rect (pygame.Rect): 画面外でも敵を起こしておく範囲（プレイヤーの矩形など）
+            
+        Returns:
+            list: 位置が変わった可能性のある敵のリスト（倒されて消えた敵を含む）
+        """
+        self.tick += 1
+        tick = self.tick
+        blocks = self.stage.block_grid
+        
+        # 起きている敵の更新（倒されて消えた敵は外す）
+        moved = list(self.awake)
+        for enemy in moved:
+            enemy.update(blocks)
+            if not enemy.alive():
+                del self.awake[enemy]
+                
+        # 敵を起こしておく範囲
+        window = self._window(camera_offset_x, focus_rect)
+        left = window.left
+        right = window.right
+        
+        # 移動範囲が近くにある眠っている敵は位置を反映し、範囲に入っていれば起こす
+        for sleeper in self.sleeper_grid.query(window):
+            sleeper.advance(tick)
+            moved.append(sleeper.enemy)
+            rect = sleeper.enemy.rect
+            if rect.right > left and rect.left < right:
+                self._own_sleepers()
+                self.sleeper_grid.remove(sleeper)
+                del self.sleepers[sleeper.enemy]
+                self.awake[sleeper.enemy] = None
+                
+        # 範囲の外にいる敵を眠らせる
+        for enemy in list(self.awake):
+            rect = enemy.rect
+            if rect.right > left and rect.left < right:
+                continue
+            patrol = self._patrol(enemy)
+            if patrol is None:
+                continue
+            sleeper = _Sleeper(enemy, tick, *patrol)
+            del self.awake[enemy]
+            self._own_sleepers()
+            self.sleepers[enemy] = sleeper
+            self.sleeper_grid.add(sleeper)
+            
+        return moved
+            
+    def _patrol(self, enemy):
+        """敵の移動範囲（左右の壁の間）を取得
+        
+        Args:
+            enemy (Enemy): 対象の敵
+            
+        Returns:
+            tuple: (left, right) 敵のX座標の最小値と最大値（往復として計算できない場合はNone）
+        """
+        rect = enemy.rect
+        if enemy.state != Enemy.ACTIVE or enemy.float_x != rect.x or enemy.float_y != rect.y:
+            return None
+        if self.stage.block_grid.query(rect):
+            return None
+            
+        # 通常状態の敵は縦に動かず壁の間から出ないため、移動範囲は敵ごとに一度だけ求める
+        key = (enemy, rect.y)
+        if key not in self._patrols:
+            left_wall = self._find_wall(rect, Enemy.DIRECTION_LEFT)
+            right_wall = self._find_wall(rect, Enemy.DIRECTION_RIGHT)
+            patrol = None
+            if left_wall is not None and right_wall is not None:
+                patrol = (left_wall, right_wall - rect.width)
+            self._patrols[key] = patrol
+            
+        patrol = self._patrols[key]
+        if patrol is None or not patrol[0] <= rect.x <= patrol[1]:
+            return None
+        return patrol
+        
+    def _find_wall(self, rect, direction):
+        """敵の進行方向にある最も近い壁の位置を探す
+        
+        Args:
+            rect (pygame.Rect): 敵の矩形（ブロックと重なっていないこと）
+            direction (int): 探す方向
+            
+        Returns:
+            int: 壁のX座標（左なら壁の右端、右なら壁の左端。見つからなければNone）
+        """
+        grid = self.stage.block_grid
+        step = self.WALL_SEARCH_STEP
+        
+        if direction == Enemy.DIRECTION_LEFT:
+            edge = rect.left
+            while edge > 0:
+                hits = grid.query(pygame.Rect(edge - step, rect.y, step, rect.height))
+                if hits:
+                    return max(block.rect.right for block in hits)
+                edge -= step
+        else:
+            edge = rect.right
+            while edge < self.stage.width:
+                hits = grid.query(pygame.Rect(edge, rect.y, step, rect.height))
+                if hits:
+                    return min(block.rect.left for block in hits)
+                edge += step
+        return None
@@ -8,226 +8,393 @@
 import pygame
 import sys
 import os
+import time
+from game.audio import AudioManager
+from game.background import BackgroundTask
 from game.game_state import GameState
-from game.player import Player
-from game.stage import Stage
+from game.generator import generated_level_path
+from game.profiler import FrameProfiler, NULL_PROFILER
+from game.renderer import StaticLayerRenderer
+from game.replay import InputRecorder
+from game.simulation import Simulation
+from game.snapshot import SnapshotRing
+from game.streaming import GeneratedChunkSource, StreamingStage
 from game.ui import UI
 
 class Game:
     """ゲームクラス"""
     
-    def __init__(self):
-        """初期化"""
-        # Pygameの初期化
-        pygame.init()
-        pygame.mixer.init()
+    # 巻き戻しできる時間（秒）
+    REWIND_SECONDS = 5
+    
+    # 物理演算のティックレート（Hz。Player・Enemy の速度などの定数はこの間隔を前提にしている）
+    TICK_RATE = 60
+    
+    # 1回の描画までに進めるティック数の上限（処理が追いつかない場合はそれ以上の遅れを捨てる）
+    MAX_TICKS_PER_FRAME = 5
+    
+    # 1ティックでこれ以上移動した場合は補間しない（リスポーンや巻き戻しによる瞬間移動）
+    INTERPOLATION_LIMIT = 100
+    
+    def __init__(self, dirty_rects=False, record_path=None, profile=False, trace_path=None, level=None,
+                 endless_seed=None, vsync=False, max_fps=0, seed=None):
+        """初期化
+        
+        Args:
+            dirty_rects (bool): ダーティ矩形モードで描画するかどうか
+                （変化した範囲だけを画面に反映し、変化のない画面は表示を省略する）
+            record_path (str): 入力を記録するファイルのパス（Noneなら記録しない）
+            profile (bool): 処理時間を計測して画面に表示するかどうか
+            trace_path (str): 処理時間のトレースを書き出すファイルのパス（.csv または .json）
+            level (str): レベル名またはJSONファイルのパス（Noneなら標準のレベル）
+            endless_seed (int): 終わりのないステージを生成する乱数のシード（Noneなら通常のステージ）
+            vsync (bool): 画面の更新を垂直同期に合わせるかどうか
+            max_fps (int): 描画の最大フレームレート（0なら制限しない）
+            seed (int): ステージを自動生成する乱数のシード（指定した場合は level の代わりに使う）
+        """
+        # 起動を始めた時刻（最初の画面を表示するまでの時間の計測に使う）
+        self._start_time = time.perf_counter()
+        self.time_to_first_frame = None  # 最初の画面を表示するまでの時間（秒）
+        
+        # Pygameの初期化（スタート画面に必要な画面とフォントだけ。音声は別スレッドで初期化する）
+        pygame.display.init()
+        pygame.font.init()
         
         # 画面設定
         self.screen_width = 800
         self.screen_height = 600
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+        if vsync:
+            # 垂直同期は SCALED（またはOPENGL）の画面でのみ有効
+            self.screen = pygame.display.set_mode((self.screen_width, self.screen_height), pygame.SCALED, vsync=1)
+        else:
+            self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
         pygame.display.set_caption("Super Cline Brothers")
         
-        # BGMの読み込みと再生
-        self._load_bgm()
-        
-        # ゲーム状態
-        self.game_state = GameState()
+        # BGMと効果音（ミキサーの初期化と再生は別スレッドで行う）
+        bgm_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "music", "157_BPM175.mp3")
+        self.audio = AudioManager(bgm_path)
         
         # UI
         self.ui = UI(self.screen_width, self.screen_height)
         
-        # ステージ
-        self.stage = Stage(3000, self.screen_height)
+        # ゲーム状態（スタート画面の表示に使うため、ステージより先に作成する）
+        self.game_state = GameState()
         
-        # プレイヤー
-        start_pos = self.stage.get_start_position()
-        self.player = Player(start_pos[0], start_pos[1])
+        # ゲームロジック（ステージ、プレイヤー、カメラ）と静的レイヤーは、スタート画面を表示している間に
+        # 別スレッドで作成する（作成が終わる前に必要になった場合は終わるまで待つ）
+        self._simulation = None
+        self.static_layer = None
+        self._world_task = BackgroundTask(self._build_world, level, seed, endless_seed)
         
-        # カメラオフセット（スクロール用）
-        self.camera_offset_x = 0
+        # 処理時間の計測
+        if profile or trace_path:
+            self.profiler = FrameProfiler(trace_path=trace_path)
+        else:
+            self.profiler = NULL_PROFILER
         
-        # クロック
+        # クロック（描画のフレームレートの制限に使う）
         self.clock = pygame.time.Clock()
+        self.max_fps = max_fps
+        
+        # 描画時の補間に使う、最後のティックの直前の状態（カメラ位置, プレイヤーの位置, 敵 -> 位置）
+        self._previous = None
+        self._alpha = 1.0
+        self._draw_camera = 0  # 描画に使うカメラ位置
         
         # キー入力の状態
         self.keys = {}
+        self._pressed_keys = []  # 前回のティック以降に押されたキー
+        
+        # 入力の記録
+        self.recorder = InputRecorder(record_path) if record_path else None
+        
+        # 巻き戻し用のスナップショット（1ティックごと）
+        # 巻き戻しは入力の記録に含められないため、記録中とチャンク単位で読み込むステージでは無効にする
+        if self.recorder is None and endless_seed is None:
+            self.rewind_buffer = SnapshotRing(self.REWIND_SECONDS * 60)
+        else:
+            self.rewind_buffer = None
+        
+        # ダーティ矩形モードの状態
+        self.dirty_rects = dirty_rects
+        self._presented_key = None      # 最後に画面へ反映した画面の状態
+        self._presented_camera = None   # 最後に画面へ反映したカメラ位置
+        self._sprite_rects = []         # 前フレームで描画したスプライトと残機表示の範囲
+        
+    def _build_world(self, level, seed, endless_seed):
+        """ゲームロジックとステージの静的レイヤーを作成（別スレッドで実行する）
+        
+        Args:
+            level (str): レベル名またはJSONファイルのパス（Noneなら標準のレベル）
+            seed (int): ステージを自動生成する乱数のシード（Noneなら level を使う）
+            endless_seed (int): 終わりのないステージを生成する乱数のシード（Noneなら通常のステージ）
+            
+        Returns:
+            tuple: (Simulation, StaticLayerRenderer)
+        """
+        # 自動生成するステージは生成と検証に時間がかかるため、ここで生成する（保存済みなら読み込むだけ）
+        if seed is not None:
+            level = generated_level_path(seed)
+            
+        # 終わりのないステージはチャンク単位で読み込む（スナップショットに対応しないためチェックポイントは使わない）
+        if endless_seed is None:
+            simulation = Simulation(self.screen_width, self.screen_height, use_checkpoints=True,
+                                    level=level, game_state=self.game_state)
+        else:
+            stage = StreamingStage(GeneratedChunkSource(endless_seed, self.screen_width),
+                                   self.screen_height, self.screen_width)
+            simulation = Simulation(self.screen_width, self.screen_height, stage=stage,
+                                    game_state=self.game_state)
+            
+        # ステージの静的レイヤー（画面幅ごとのチャンクで事前描画）
+        static_layer = StaticLayerRenderer(simulation.stage, self.screen_width, self.screen_height)
+        return simulation, static_layer
+        
+    def _install_world(self):
+        """別スレッドで作成したゲームロジックと静的レイヤーを取り込む（作成中なら終わるまで待つ）"""
+        self._simulation, self.static_layer = self._world_task.result()
+        self._simulation.profiler = self.profiler
+        
+    @property
+    def simulation(self):
+        """ゲームロジック（作成中なら作成が終わるまで待つ）"""
+        if self._simulation is None:
+            self._install_world()
+        return self._simulation
+        
+    @property
+    def stage(self):
+        """ステージ"""
+        return self.simulation.stage
+        
+    @property
+    def player(self):
+        """プレイヤー"""
+        return self.simulation.player
+        
+    @property
+    def camera_offset_x(self):
+        """カメラオフセット（スクロール用。ゲームロジックの作成中は0）"""
+        if self._simulation is None:
+            return 0
+        return self._simulation.camera_offset_x
+        
+    def _poll_background(self):
+        """別スレッドの初期化が終わっていれば結果を反映する"""
+        if self._simulation is None and self._world_task.done():
+            self._install_world()
         
     def handle_events(self):
         """イベント処理"""
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.quit()
+                self.close()
                 sys.exit()
                 
             elif event.type == pygame.KEYDOWN:
-                self.keys[event.key] = True
+                self._pressed_keys.append(event.key)
+                self.handle_key_down(event.key)
                 
-                # スタート画面
-                if self.game_state.state == GameState.START:
-                    if event.key == pygame.K_a:
-                        self.game_state.start_game()
-                        self._update_bgm()  # BGM状態を更新
-                        
-                # リトライ画面
-                elif self.game_state.state == GameState.RETRY:
-                    if event.key == pygame.K_LEFT or event.key == pygame.K_RIGHT:
-                        # 選択の切り替え
-                        self.game_state.select_retry(1 - self.game_state.retry_selection)
-                    elif event.key == pygame.K_RETURN:
-                        # 選択の確定
-                        self.game_state.confirm_retry()
-                        # BGM状態を更新
-                        self._update_bgm()
-                        if self.game_state.state == GameState.PLAYING:
-                            # リトライする場合はプレイヤーの位置をリセットし、敵を復活させる
-                            self.stage.reset()
-                            start_pos = self.stage.get_start_position()
-                            self.player.reset_position(start_pos[0], start_pos[1])
-                            self.camera_offset_x = 0
-                            
-                # リザルト画面
-                elif self.game_state.state == GameState.RESULT:
-                    if event.key == pygame.K_RETURN:
-                        # ゲームを再スタート
-                        self.game_state.restart_game()
-                        self.stage.reset()
-                        start_pos = self.stage.get_start_position()
-                        self.player.reset_position(start_pos[0], start_pos[1])
-                        self.camera_offset_x = 0
-                        # BGM状態を更新
-                        self._update_bgm()
-                        
             elif event.type == pygame.KEYUP:
                 self.keys[event.key] = False
                 
+            elif event.type == pygame.VIDEOEXPOSE:
+                # ウィンドウが再表示された場合は次のフレームで全体を描き直す
+                self._presented_key = None
+                
+                
+    def close(self):
+        """終了処理（入力の記録の保存、トレースファイルと音声のスレッドの終了。何度呼んでもよい）"""
+        if self.recorder is not None:
+            self.recorder.save()
+        self.profiler.close()
+        self.audio.close()
+        pygame.quit()
+        
+    def handle_key_down(self, key):
+        """キーが押されたときの処理
+        
+        Args:
+            key (int): 押されたキー
+        """
+        self.keys[key] = True
+        
+        # スタート画面
+        if self.game_state.state == GameState.START:
+            if key == pygame.K_a:
+                self.simulation.start()
+                self._update_bgm()  # BGM状態を更新
+                
+        # リトライ画面
+        elif self.game_state.state == GameState.RETRY:
+            if key == pygame.K_LEFT or key == pygame.K_RIGHT:
+                # 選択の切り替え
+                self.game_state.select_retry(1 - self.game_state.retry_selection)
+            elif key == pygame.K_RETURN:
+                # 選択の確定
+                self.game_state.confirm_retry()
+                # BGM状態を更新
+                self._update_bgm()
+                if self.game_state.state == GameState.PLAYING:
+                    # リトライする場合は最後のチェックポイント（なければスタート位置）から再開する
+                    self.simulation.reset_stage(use_checkpoint=True)
+                    self._clear_rewind()
+                    self._previous = None
+                    
+        # リザルト画面
+        elif self.game_state.state == GameState.RESULT:
+            if key == pygame.K_RETURN:
+                # ゲームを再スタート
+                self.game_state.restart_game()
+                self.simulation.reset_stage()
+                self._clear_rewind()
+                self._previous = None
+                # BGM状態を更新
+                self._update_bgm()
+                
+    def tick(self):
+        """1ティック分の入力を記録し、ゲーム状態を更新"""
+        if self.recorder is not None:
+            self.recorder.record(self._read_inputs(), self._pressed_keys)
+        self._pressed_keys = []
+        self.update()
+        
     def update(self):
         """ゲーム状態の更新"""
         if self.game_state.state == GameState.PLAYING:
-            # プレイヤーの入力処理
-            is_dashing = self.keys.get(pygame.K_LSHIFT, False) or self.keys.get(pygame.K_RSHIFT, False)
+            previous_state = self.game_state.state
             
-            if self.keys.get(pygame.K_LEFT, False):
-                self.player.move_left(is_dashing)
-            elif self.keys.get(pygame.K_RIGHT, False):
-                self.player.move_right(is_dashing)
-            else:
-                self.player.stop()
-                
-            if self.keys.get(pygame.K_SPACE, False):
-                self.player.jump()
+            # 巻き戻しキーを押している間は1ティックずつ過去の状態に戻す
+            if self.rewind_buffer is not None and self.keys.get(pygame.K_BACKSPACE, False):
+                snapshot = self.rewind_buffer.pop()
+                if snapshot is not None:
+                    self.simulation.restore(snapshot)
+                return
                 
-            # プレイヤーの更新
-            self.player.update(self.stage.blocks)
+            # キー入力をシミュレーションの入力に変換して1ティック進める
+            self.simulation.step(self._read_inputs())
+            self.audio.play_events(self.simulation.events)
             
-            # ステージの更新
-            self.stage.update()
-            
-            # カメラのスクロール
-            self._update_camera()
-            
-            # 衝突判定
-            self._check_collisions()
+            # プレイ中なら巻き戻し用に状態を記録
+            if self.rewind_buffer is not None and self.game_state.state == GameState.PLAYING:
+                self.rewind_buffer.push(self.simulation.snapshot())
+                
+            # 残機が減った場合やゴールした場合はBGM状態を更新
+            if self.game_state.state != previous_state:
+                self._update_bgm()
+                
+    def _clear_rewind(self):
+        """巻き戻し用のスナップショットを破棄（残機を減らす前には戻れないようにする）"""
+        if self.rewind_buffer is not None:
+            self.rewind_buffer.clear()
             
-    def _update_camera(self):
-        """カメラ位置の更新"""
-        # プレイヤーが画面中央より右にいる場合、カメラを追従させる
-        player_screen_x = self.player.rect.x - self.camera_offset_x
-        if player_screen_x > self.screen_width // 2:
-            self.camera_offset_x = self.player.rect.x - self.screen_width // 2
+    def _read_inputs(self):
+        """キー入力の状態をシミュレーションの入力ビットに変換
+        
+        Returns:
+            int: 入力ビットの論理和
+        """
+        inputs = 0
+        if self.keys.get(pygame.K_LEFT, False):
+            inputs |= Simulation.INPUT_LEFT
+        if self.keys.get(pygame.K_RIGHT, False):
+            inputs |= Simulation.INPUT_RIGHT
+        if self.keys.get(pygame.K_LSHIFT, False) or self.keys.get(pygame.K_RSHIFT, False):
+            inputs |= Simulation.INPUT_DASH
+        if self.keys.get(pygame.K_SPACE, False):
+            inputs |= Simulation.INPUT_JUMP
+        return inputs
+        
+    def _visible_enemies(self, camera_offset_x):
+        """画面の近く（左右上下に INTERPOLATION_LIMIT の余白）にいる敵を取得
+        
+        敵の空間インデックスから取り出すため、ステージ全体の敵の数によらない。
+        カメラが大きく動いた直後（リスポーンなど）でも正しい位置になるよう、眠っている敵の位置を先に合わせる。
+        
+        Args:
+            camera_offset_x (int): カメラのXオフセット
             
-        # カメラが左端より左に行かないようにする
-        if self.camera_offset_x < 0:
-            self.camera_offset_x = 0
+        Returns:
+            list: 敵のリスト（ステージに追加した順）
+        """
+        limit = self.INTERPOLATION_LIMIT
+        view = pygame.Rect(camera_offset_x - limit, -limit,
+                           self.screen_width + limit * 2, self.screen_height + limit * 2)
+        self.stage.sync_enemies(camera_offset_x)
+        return self.stage.enemy_broadphase.query(view)
+        
+    def _save_previous(self):
+        """次のティックの直前の状態を記録（描画時の補間に使う）
+        
+        プレイ中以外は補間しないため記録しない。スタート画面ではゲームロジックを参照しないため、
+        別スレッドでのステージの作成を待たない（作成を待つのはプレイを始めるときだけ）。
+        """
+        if self._simulation is None or self.game_state.state != GameState.PLAYING:
+            self._previous = None
+            return
+        camera_offset_x = self.camera_offset_x
+        enemies = {enemy: enemy.rect.topleft for enemy in self._visible_enemies(camera_offset_x)}
+        self._previous = (camera_offset_x, self.player.rect.topleft, enemies)
+        
+    def _interpolate(self, previous, current):
+        """直前のティックと現在の値を補間
+        
+        Args:
+            previous (int): 直前のティックの値
+            current (int): 現在の値
             
-        # カメラが右端より右に行かないようにする
-        max_offset = self.stage.width - self.screen_width
-        if self.camera_offset_x > max_offset:
-            self.camera_offset_x = max_offset
+        Returns:
+            int: 描画に使う値
+        """
+        if abs(current - previous) > self.INTERPOLATION_LIMIT:
+            return current
+        return round(previous + (current - previous) * self._alpha)
+        
+    def _draw_position(self, rect, previous):
+        """スプライトを描画する位置（ステージ上の座標）
+        
+        Args:
+            rect (pygame.Rect): スプライトの現在の矩形
+            previous (tuple): 直前のティックの位置 (x, y)（Noneなら補間しない）
             
-    def _check_collisions(self):
-        """衝突判定"""
-        # 敵との衝突判定
-        for enemy in self.stage.enemies:
-            collision_type = enemy.check_collision_with_player(self.player)
+        Returns:
+            tuple: (x, y)
+        """
+        if previous is None or self._alpha >= 1.0:
+            return rect.topleft
+        return (self._interpolate(previous[0], rect.x), self._interpolate(previous[1], rect.y))
+        
+    def draw(self, alpha=1.0):
+        """描画処理
+        
+        Args:
+            alpha (float): 直前のティックから現在のティックまでの補間の割合（1.0なら現在の状態をそのまま描画）
+        """
+        # 描画に使うカメラ位置（プレイ中以外の画面は止まっているため補間せず、最後のティックの状態を描画する）
+        if self._previous is not None and self.game_state.state == GameState.PLAYING:
+            self._alpha = alpha
+        else:
+            self._alpha = 1.0
+        if self._alpha < 1.0:
+            self._draw_camera = self._interpolate(self._previous[0], self.camera_offset_x)
+        else:
+            self._draw_camera = self.camera_offset_x
             
-            if collision_type == 1:  # 上からの衝突
-                enemy.defeat()
-                # Shiftキーを押している場合は通常ジャンプと同じ勢いで跳ね返る
-                is_dashing = self.keys.get(pygame.K_LSHIFT, False) or self.keys.get(pygame.K_RSHIFT, False)
-                if is_dashing:
-                    self.player.vel_y = -self.player.JUMP_POWER  # 通常ジャンプと同じ勢い
-                else:
-                    self.player.vel_y = -10  # 通常の跳ね返り
-            elif collision_type == 2:  # その他の衝突（ダメージ）
-                # プレイヤーをダメージ状態にする
-                self.player.take_damage()
-                    
-        # 穴に落ちた判定またはダメージ状態で画面外に出た判定
-        if self.player.rect.y > self.screen_height:
-            self.game_state.lose_life()
-            # BGM状態を更新
-            self._update_bgm()
-            if self.game_state.state == GameState.PLAYING:
-                # まだ残機がある場合は位置をリセット
-                start_pos = self.stage.get_start_position()
-                self.player.reset_position(start_pos[0], start_pos[1])
-                self.camera_offset_x = 0
-                
-        # ゴールとの衝突判定
-        if pygame.sprite.collide_rect(self.player, self.stage.goal):
-            self.game_state.clear_game()
-            self._update_bgm()  # BGM状態を更新
+        if self.dirty_rects:
+            self._draw_dirty()
+            return
             
-    def draw(self):
-        """描画処理"""
         if self.game_state.state == GameState.START:
             # スタート画面
             self.ui.draw_start_screen(self.screen)
             
         elif self.game_state.state == GameState.PLAYING:
             # ゲーム画面
-            self.screen.fill((135, 206, 235))  # 空色の背景
-            
-            # ステージの描画（カメラオフセットを適用）
-            for block in self.stage.blocks:
-                self.screen.blit(block.image, (block.rect.x - self.camera_offset_x, block.rect.y))
-                
-            for enemy in self.stage.enemies:
-                self.screen.blit(enemy.image, (enemy.rect.x - self.camera_offset_x, enemy.rect.y))
-                
-            # ゴールの描画
-            self.screen.blit(self.stage.goal.image, 
-                            (self.stage.goal.rect.x - self.camera_offset_x, self.stage.goal.rect.y))
-                
-            # プレイヤーの描画
-            self.screen.blit(self.player.image, 
-                            (self.player.rect.x - self.camera_offset_x, self.player.rect.y))
-                
-            # 残機の描画
-            self.ui.draw_lives(self.screen, self.game_state.lives)
+            self._draw_world()
             
         elif self.game_state.state == GameState.RETRY:
             # リトライ画面（ゲーム画面の上に重ねて描画）
-            self.screen.fill((135, 206, 235))  # 空色の背景
-            
-            # ステージの描画
-            for block in self.stage.blocks:
-                self.screen.blit(block.image, (block.rect.x - self.camera_offset_x, block.rect.y))
-                
-            for enemy in self.stage.enemies:
-                self.screen.blit(enemy.image, (enemy.rect.x - self.camera_offset_x, enemy.rect.y))
-                
-            # ゴールの描画
-            self.screen.blit(self.stage.goal.image, 
-                            (self.stage.goal.rect.x - self.camera_offset_x, self.stage.goal.rect.y))
-                
-            # プレイヤーの描画
-            self.screen.blit(self.player.image, 
-                            (self.player.rect.x - self.camera_offset_x, self.player.rect.y))
-                
-            # 残機の描画
-            self.ui.draw_lives(self.screen, self.game_state.lives)
+            self._draw_world()
             
             # リトライ画面のUI
             self.ui.draw_retry_screen(self.screen, self.game_state.retry_selection)
@@ -237,40 +404,137 @@ class Game:
             self.ui.draw_result_screen(self.screen, self.game_state.is_cleared)
             
         # 画面の更新
-        pygame.display.flip()
-        
-    def _load_bgm(self):
-        """BGMを読み込む"""
-        try:
-            # BGMファイルのパス
-            bgm_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 
-                                    "assets", "music", "157_BPM175.mp3")
+        with self.profiler.section("draw.flip"):
+            pygame.display.flip()
+        
+    def _draw_dirty(self):
+        """描画処理（ダーティ矩形モード）"""
+        state = self.game_state.state
+        screen_key = (state, self.game_state.retry_selection, self.game_state.is_cleared)
+        
+        if state == GameState.PLAYING:
+            if screen_key == self._presented_key and self._draw_camera == self._presented_camera:
+                # スクロールしていない場合は、前フレームのスプライトの跡だけ背景を描き直す
+                with self.profiler.section("draw.blocks"):
+                    for rect in self._sprite_rects:
+                        self.static_layer.draw(self.screen, self._draw_camera, rect)
+                sprite_rects = self._draw_world_sprites()
+                with self.profiler.section("draw.flip"):
+                    pygame.display.update(self._sprite_rects + sprite_rects)
+            else:
+                # スクロールした場合や画面が切り替わった場合は全体を描き直す
+                sprite_rects = self._draw_world()
+                with self.profiler.section("draw.flip"):
+                    pygame.display.update()
+            self._sprite_rects = sprite_rects
+            self._presented_camera = self._draw_camera
             
-            # BGMを読み込む
-            pygame.mixer.music.load(bgm_path)
-            pygame.mixer.music.set_volume(0.25)  # 音量を25%に設定（元の半分）
+        elif screen_key != self._presented_key:
+            # スタート・リトライ・リザルト画面は変化があったときだけ描画する
+            if state == GameState.START:
+                self.ui.draw_start_screen(self.screen)
+            elif state == GameState.RETRY:
+                self._draw_world()
+                self.ui.draw_retry_screen(self.screen, self.game_state.retry_selection)
+            elif state == GameState.RESULT:
+                self.ui.draw_result_screen(self.screen, self.game_state.is_cleared)
+            with self.profiler.section("draw.flip"):
+                pygame.display.update()
             
-            # 初期状態ではBGMを再生しない（ゲーム開始時に再生）
-        except Exception as e:
-            print(f"BGMの読み込みに失敗しました: {e}")
+        self._presented_key = screen_key
+        
+    def _draw_world(self):
+        """ゲーム画面（ステージ、プレイヤー、残機）を描画
+        
+        Returns:
+            list: 敵、プレイヤー、残機を描画した範囲のリスト
+        """
+        # ステージの静的レイヤー（背景、ブロック、ゴール）の描画
+        with self.profiler.section("draw.blocks"):
+            self.static_layer.draw(self.screen, self._draw_camera)
+        
+        return self._draw_world_sprites()
+        
+    def _draw_world_sprites(self):
+        """敵、プレイヤー、残機を描画
+        
+        Returns:
+            list: 描画した範囲のリスト
+        """
+        rects = []
+        
+        with self.profiler.section("draw.enemies"):
+            # 画面内の敵だけを描画（位置は直前のティックとの間で補間する）
+            camera_offset_x = self._draw_camera
+            view_left = camera_offset_x
+            view_right = camera_offset_x + self.screen_width
+            previous_enemies = self._previous[2] if self._previous is not None else {}
+            for enemy in self._visible_enemies(camera_offset_x):
+                x, y = self._draw_position(enemy.rect, previous_enemies.get(enemy))
+                if x + enemy.rect.width > view_left and x < view_right:
+                    rects.append(self.screen.blit(enemy.image, (x - camera_offset_x, y)))
+                    
+            # プレイヤーの描画
+            previous_player = self._previous[1] if self._previous is not None else None
+            x, y = self._draw_position(self.player.rect, previous_player)
+            rects.append(self.screen.blit(self.player.image, (x - camera_offset_x, y)))
+                                          
+        with self.profiler.section("draw.hud"):
+            # 残機の描画
+            rects.append(self.ui.draw_lives(self.screen, self.game_state.lives))
             
+            # 処理時間の表示
+            if self.profiler.enabled:
+                rects.append(self.profiler.draw_overlay(self.screen))
+                
+        return rects
+        
     def _update_bgm(self):
-        """ゲーム状態に応じてBGMの再生状態を更新"""
-        # プレイ中のみBGMを再生
-        if self.game_state.state == GameState.PLAYING:
-            if not pygame.mixer.music.get_busy():
-                pygame.mixer.music.play(-1)  # -1を指定すると無限ループ
-        else:
-            # それ以外の状態ではBGMを停止
-            pygame.mixer.music.stop()
+        """ゲーム状態に応じてBGMの再生状態を更新（プレイ中のみ再生する）"""
+        self.audio.set_music(self.game_state.state == GameState.PLAYING)
     
     def run(self):
-        """ゲームループ"""
+        """ゲームループ
+        
+        物理演算は経過時間を蓄積して TICK_RATE の固定間隔で進め、描画はそれとは独立に毎回行う
+        （max_fps か垂直同期で制限しない限り上限なし）。描画する位置は直前の2ティックの状態を
+        蓄積した時間の割合で補間する。
+        """
+        profiler = self.profiler
+        tick_seconds = 1.0 / self.TICK_RATE
+        accumulator = 0.0
+        last_time = time.perf_counter()
         while True:
-            self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(60)  # 60FPS
+            profiler.begin_frame()
+            now = time.perf_counter()
+            accumulator += now - last_time
+            last_time = now
+            
+            with profiler.section("events"):
+                self._poll_background()
+                self.handle_events()
+            with profiler.section("update"):
+                ticks = min(int(accumulator / tick_seconds), self.MAX_TICKS_PER_FRAME)
+                for i in range(ticks):
+                    if i == ticks - 1:
+                        self._save_previous()
+                    self.tick()
+                accumulator -= ticks * tick_seconds
+                
+                # 上限まで進めても追いつかない場合は遅れを捨てる
+                # （処理が重いほど進めるティックが増えて、さらに遅れるのを防ぐ）
+                if accumulator >= tick_seconds:
+                    accumulator %= tick_seconds
+            with profiler.section("draw"):
+                self.draw(accumulator / tick_seconds)
+            profiler.end_frame()
+            
+            # 最初の画面を表示するまでの時間
+            if self.time_to_first_frame is None:
+                self.time_to_first_frame = time.perf_counter() - self._start_time
+                if profiler.enabled:
+                    print(f"最初の画面の表示まで: {self.time_to_first_frame * 1000:.1f} ms")
+            self.clock.tick(self.max_fps)
 
 
 if __name__ == "__main__":
@@ -6,6 +6,7 @@
 """
 
 import pygame
+from game.atlas import solid_image
 
 class Player(pygame.sprite.Sprite):
     """プレイヤークラス"""
@@ -31,9 +32,8 @@ class Player(pygame.sprite.Sprite):
         """
         super().__init__()
         
-        # プレイヤーの画像を作成（シンプルな四角形）
-        self.image = pygame.Surface((30, 50))
-        self.image.fill((0, 0, 255))  # 青色
+        # プレイヤーの画像（シンプルな四角形）
+        self.image = solid_image(30, 50, (0, 0, 255))  # 青色
         self.rect = self.image.get_rect()
         
         # 位置を設定
@@ -54,8 +54,11 @@ class Player(pygame.sprite.Sprite):
     def update(self, blocks):
         """プレイヤーの状態を更新
         
+        横・縦の軸ごとに、移動前から移動後までに通過する範囲とブロックの衝突を判定し、
+        最初に接触するブロックの手前で止める（速度が大きくてもブロックをすり抜けない）。
+        
         Args:
-            blocks (pygame.sprite.Group): ブロックのグループ
+            blocks (SpatialGrid): ブロックの空間インデックス
         """
         # ダメージ状態の場合は、ブロックとの衝突判定を行わず落下するだけ
         if self.state == self.DAMAGED:
@@ -65,33 +68,35 @@ class Player(pygame.sprite.Sprite):
             return
             
         # 横方向の移動
+        start_rect = self.rect.copy()
         self.float_x += self.vel_x
         self.rect.x = int(self.float_x)
         
-        # ブロックとの衝突判定（横方向）
-        block_hit_list = pygame.sprite.spritecollide(self, blocks, False)
-        for block in block_hit_list:
+        # ブロックとの衝突判定（横方向。通過した範囲で最も手前のブロックに合わせる）
+        block_hit_list = blocks.query(self.rect.union(start_rect))
+        if block_hit_list:
             if self.vel_x > 0:  # 右に移動中
-                self.rect.right = block.rect.left
+                self.rect.right = min(block.rect.left for block in block_hit_list)
             elif self.vel_x < 0:  # 左に移動中
-                self.rect.left = block.rect.right
+                self.rect.left = max(block.rect.right for block in block_hit_list)
             self.float_x = float(self.rect.x)
         
         # 縦方向の移動
         if self.state == self.JUMPING or self.state == self.FALLING:
             self.vel_y += self.GRAVITY  # 重力を適用
             
+        start_rect = self.rect.copy()
         self.float_y += self.vel_y
         self.rect.y = int(self.float_y)
         
-        # ブロックとの衝突判定（縦方向）
-        block_hit_list = pygame.sprite.spritecollide(self, blocks, False)
-        for block in block_hit_list:
+        # ブロックとの衝突判定（縦方向。通過した範囲で最も手前のブロックに合わせる）
+        block_hit_list = blocks.query(self.rect.union(start_rect))
+        if block_hit_list:
             if self.vel_y > 0:  # 下に移動中
-                self.rect.bottom = block.rect.top
+                self.rect.bottom = min(block.rect.top for block in block_hit_list)
                 self.state = self.STANDING  # 地面に着地
             elif self.vel_y < 0:  # 上に移動中
-                self.rect.top = block.rect.bottom
+                self.rect.top = max(block.rect.bottom for block in block_hit_list)
                 self.vel_y = 0  # 上昇を止める
             self.float_y = float(self.rect.y)
             
@@ -99,7 +104,7 @@ class Player(pygame.sprite.Sprite):
         if self.state == self.STANDING:
             # 足元に何もないか確認
             self.rect.y += 2
-            platform_hit_list = pygame.sprite.spritecollide(self, blocks, False)
+            platform_hit_list = blocks.spritecollide(self)
             self.rect.y -= 2
             
             if not platform_hit_list:
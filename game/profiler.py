@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+フレーム時間計測モジュール
+"""
+
+from collections import deque
+import json
+import os
+import time
+import pygame
+
+
+class _Section:
+    """計測区間（with文で囲んだ処理の時間を記録する）"""
+    
+    __slots__ = ("profiler", "name", "start")
+    
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+        
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+        
+    def __exit__(self, *exc_info):
+        self.profiler.add(self.name, self.start, time.perf_counter())
+        return False
+
+
+class _NullSection:
+    """何もしない計測区間"""
+    
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, *exc_info):
+        return False
+
+
+class NullProfiler:
+    """何も計測しないプロファイラ（計測無効時に使用）"""
+    
+    enabled = False
+    _SECTION = _NullSection()
+    
+    def section(self, name):
+        """計測区間を取得
+        
+        Args:
+            name (str): 区間名
+            
+        Returns:
+            _NullSection: 何もしない計測区間
+        """
+        return self._SECTION
+        
+    def begin_frame(self):
+        """フレームの開始"""
+        
+    def end_frame(self):
+        """フレームの終了"""
+        
+    def close(self):
+        """終了処理"""
+
+
+# 計測無効時に共有するプロファイラ
+NULL_PROFILER = NullProfiler()
+
+
+class FrameProfiler:
+    """フレーム時間計測クラス
+    
+    フレーム内の各処理の時間を計測し、直近のフレームについて
+    p50/p95/p99 と処理落ちしたフレーム数を集計する。
+    画面へのオーバーレイ表示と、CSV/JSON形式のトレースファイルへの出力に対応する。
+    """
+    
+    enabled = True
+    
+    # 計測する処理（トレースファイルの列の順）
+    PHASES = (
+        "frame",
+        "events",
+        "update",
+        "update.player",
+        "update.stage",
+        "update.camera",
+        "update.collisions",
+        "draw",
+        "draw.blocks",
+        "draw.enemies",
+        "draw.hud",
+        "draw.flip",
+    )
+    
+    # 1フレームの予算（秒）。これを超えたフレームを処理落ちとして数える
+    FRAME_BUDGET = 1 / 60
+    
+    # オーバーレイの表示を更新する間隔（フレーム数）
+    OVERLAY_INTERVAL = 30
+    
+    def __init__(self, window=300, trace_path=None):
+        """初期化
+        
+        Args:
+            window (int): 集計する直近のフレーム数
+            trace_path (str): トレースファイルのパス（拡張子が .json ならJSON、それ以外はCSV。Noneなら出力しない）
+        """
+        self.window = window
+        self.samples = {name: deque(maxlen=window) for name in self.PHASES}
+        self.sections = {name: _Section(self, name) for name in self.PHASES}
+        self.frame_count = 0
+        self.dropped_frames = 0
+        
+        # 現在のフレームで計測した時間（秒）
+        self._current = {}
+        self._events = []
+        self._frame_start = 0.0
+        self._trace_origin = time.perf_counter()
+        
+        # オーバーレイ
+        self._overlay = None
+        self._overlay_font = None
+        
+        # トレースファイル
+        self._trace = None
+        self._trace_json = False
+        if trace_path:
+            self._trace_json = os.path.splitext(trace_path)[1].lower() == ".json"
+            self._trace = open(trace_path, "w", encoding="utf-8")
+            if self._trace_json:
+                # Chromeのトレースビューア（chrome://tracing, Perfetto）で読める形式
+                self._trace.write('{"traceEvents": [\n')
+                self._trace_first = True
+            else:
+                self._trace.write(",".join(("frame_index",) + tuple(f"{name}_ms" for name in self.PHASES)) + "\n")
+                
+    def section(self, name):
+        """計測区間を取得
+        
+        Args:
+            name (str): 区間名（PHASES のいずれか）
+            
+        Returns:
+            _Section: with文で使う計測区間
+        """
+        return self.sections[name]
+        
+    def add(self, name, start, end):
+        """計測結果を追加
+        
+        Args:
+            name (str): 区間名
+            start (float): 開始時刻（time.perf_counter）
+            end (float): 終了時刻（time.perf_counter）
+        """
+        self._current[name] = self._current.get(name, 0.0) + (end - start)
+        if self._trace_json:
+            self._events.append((name, start, end))
+            
+    def begin_frame(self):
+        """フレームの開始"""
+        self._current.clear()
+        self._events.clear()
+        self._frame_start = time.perf_counter()
+        
+    def end_frame(self):
+        """フレームの終了（フレーム待ちの前に呼ぶ）"""
+        end = time.perf_counter()
+        self.add("frame", self._frame_start, end)
+        for name in self.PHASES:
+            self.samples[name].append(self._current.get(name, 0.0))
+            
+        if self._current["frame"] > self.FRAME_BUDGET:
+            self.dropped_frames += 1
+            
+        if self._trace is not None:
+            self._write_trace()
+            
+        self.frame_count += 1
+        if self.frame_count % self.OVERLAY_INTERVAL == 0:
+            self._overlay = None
+            
+    def percentiles(self, name):
+        """直近のフレームでの処理時間のパーセンタイル
+        
+        Args:
+            name (str): 区間名
+            
+        Returns:
+            tuple: (p50, p95, p99) 単位はミリ秒
+        """
+        values = sorted(self.samples[name])
+        if not values:
+            return (0.0, 0.0, 0.0)
+        last = len(values) - 1
+        return tuple(values[min(last, int(last * p + 0.5))] * 1000 for p in (0.5, 0.95, 0.99))
+        
+    def _write_trace(self):
+        """現在のフレームの計測結果をトレースファイルに書き込む"""
+        if self._trace_json:
+            for name, start, end in self._events:
+                event = {
+                    "name": name, "ph": "X", "pid": 0, "tid": 0,
+                    "ts": round((start - self._trace_origin) * 1e6, 1),
+                    "dur": round((end - start) * 1e6, 1),
+                    "args": {"frame": self.frame_count},
+                }
+                if not self._trace_first:
+                    self._trace.write(",\n")
+                self._trace.write(json.dumps(event))
+                self._trace_first = False
+        else:
+            row = [str(self.frame_count)]
+            row.extend(f"{self._current.get(name, 0.0) * 1000:.4f}" for name in self.PHASES)
+            self._trace.write(",".join(row) + "\n")
+            
+    def draw_overlay(self, screen):
+        """計測結果を画面左上に表示
+        
+        Args:
+            screen (pygame.Surface): 描画対象の画面
+            
+        Returns:
+            pygame.Rect: 描画した範囲
+        """
+        if self._overlay is None:
+            self._overlay = self._render_overlay()
+        return screen.blit(self._overlay, (10, 10))
+        
+    def _render_overlay(self):
+        """オーバーレイのSurfaceを作成
+        
+        Returns:
+            pygame.Surface: オーバーレイ
+        """
+        if self._overlay_font is None:
+            self._overlay_font = pygame.font.Font(None, 18)
+            
+        # 区間名と p50/p95/p99（ミリ秒）の表
+        rows = [("phase (ms)", "p50", "p95", "p99")]
+        for name in self.PHASES:
+            rows.append((name,) + tuple(f"{value:.2f}" for value in self.percentiles(name)))
+        rows.append((f"dropped {self.dropped_frames} / {self.frame_count}", "", "", ""))
+        
+        font = self._overlay_font
+        line_height = font.get_linesize()
+        columns = (4, 120, 165, 210)  # 各列の右端（1列目は左端）
+        overlay = pygame.Surface((columns[-1] + 6, line_height * len(rows) + 8), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 160))
+        for i, row in enumerate(rows):
+            y = 4 + i * line_height
+            overlay.blit(font.render(row[0], True, (255, 255, 255)), (columns[0], y))
+            for text, right in zip(row[1:], columns[1:]):
+                surface = font.render(text, True, (255, 255, 255))
+                overlay.blit(surface, (right - surface.get_width(), y))
+        return overlay
+        
+    def close(self):
+        """トレースファイルを閉じる"""
+        if self._trace is not None:
+            if self._trace_json:
+                self._trace.write("\n]}\n")
+            self._trace.close()
+            self._trace = None
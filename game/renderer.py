@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+描画モジュール
+"""
+
+from collections import OrderedDict
+import pygame
+
+
+class StaticLayerRenderer:
+    """静的レイヤー描画クラス
+    
+    ステージの動かない要素（ブロックとゴール）を固定幅のチャンクごとに
+    Surfaceへ事前描画してキャッシュし、カメラに重なるチャンクだけを描画する。
+    """
+    
+    # 背景色（空色）
+    BACKGROUND_COLOR = (135, 206, 235)
+    
+    def __init__(self, stage, chunk_width, height, max_chunks=4):
+        """初期化
+        
+        Args:
+            stage (Stage): 描画するステージ
+            chunk_width (int): チャンク1つの幅（ピクセル）
+            height (int): チャンクの高さ（ピクセル）
+            max_chunks (int): キャッシュしておくチャンクの最大数
+        """
+        self.stage = stage
+        self.chunk_width = chunk_width
+        self.height = height
+        self.max_chunks = max_chunks
+        
+        # チャンク番号 -> 描画済みSurface（最近使ったものほど末尾）
+        self.chunks = OrderedDict()
+        
+    def invalidate(self, stage=None):
+        """キャッシュを破棄
+        
+        Args:
+            stage (Stage): 新しいステージ（省略時は現在のステージのまま）
+        """
+        if stage is not None:
+            self.stage = stage
+        self.chunks.clear()
+        
+    def _get_chunk(self, index):
+        """チャンクを取得（キャッシュになければ描画する）
+        
+        Args:
+            index (int): チャンク番号
+            
+        Returns:
+            pygame.Surface: チャンクのSurface
+        """
+        surface = self.chunks.get(index)
+        if surface is not None:
+            self.chunks.move_to_end(index)
+            return surface
+            
+        surface = self._render_chunk(index)
+        self.chunks[index] = surface
+        
+        # 最も長く使われていないチャンクから破棄
+        while len(self.chunks) > self.max_chunks:
+            self.chunks.popitem(last=False)
+            
+        return surface
+        
+    def _render_chunk(self, index):
+        """チャンクを描画
+        
+        Args:
+            index (int): チャンク番号
+            
+        Returns:
+            pygame.Surface: 描画したSurface
+        """
+        left = index * self.chunk_width
+        area = pygame.Rect(left, 0, self.chunk_width, self.height)
+        
+        surface = pygame.Surface(area.size)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        surface.fill(self.BACKGROUND_COLOR)
+        
+        for block in self.stage.block_grid.query(area):
+            surface.blit(block.image, (block.rect.x - left, block.rect.y))
+            
+        goal = self.stage.goal
+        if goal is not None and area.colliderect(goal.rect):
+            surface.blit(goal.image, (goal.rect.x - left, goal.rect.y))
+            
+        return surface
+        
+    def draw(self, screen, camera_offset_x, area=None):
+        """カメラに重なるチャンクを描画
+        
+        Args:
+            screen (pygame.Surface): 描画対象の画面
+            camera_offset_x (int): カメラのXオフセット
+            area (pygame.Rect): 描き直す画面上の範囲（省略時は画面全体）
+        """
+        if area is None:
+            left, right = 0, screen.get_width()
+        else:
+            left, right = area.left, area.right
+            screen.set_clip(area)
+            
+        first = (camera_offset_x + left) // self.chunk_width
+        last = (camera_offset_x + right - 1) // self.chunk_width
+        for index in range(first, last + 1):
+            screen.blit(self._get_chunk(index),
+                        (index * self.chunk_width - camera_offset_x, 0))
+                        
+        if area is not None:
+            screen.set_clip(None)
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+入力記録・リプレイモジュール
+"""
+
+import struct
+import pygame
+from game.simulation import Simulation
+
+# ファイル形式
+#   ヘッダ: マジック(4バイト) + バージョン(1バイト) + フレーム数(uint32) + キー押下の数(uint32)
+#   フレーム: (連続フレーム数(可変長整数), フレームの値(1バイト)) の繰り返し
+#   キー押下: (前のキー押下からのフレーム数(可変長整数), キーの番号(1バイト)) を押した順に繰り返し
+MAGIC = b"SCBR"
+VERSION = 2
+_HEADER = struct.Struct("<4sBII")
+
+# フレームの値は押し続けているキー（Simulation.INPUT_*）
+HELD_MASK = 0x0F
+
+# 記録するメニュー操作用のキー（キー押下はこの番号で記録する）
+MENU_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_RETURN, pygame.K_a)
+_MENU_KEY_IDS = {key: i for i, key in enumerate(MENU_KEYS)}
+
+# 押し続けているキーの入力ビットと、リプレイ時に押下状態にするキー
+HELD_KEYS = (
+    (Simulation.INPUT_LEFT, pygame.K_LEFT),
+    (Simulation.INPUT_RIGHT, pygame.K_RIGHT),
+    (Simulation.INPUT_DASH, pygame.K_LSHIFT),
+    (Simulation.INPUT_JUMP, pygame.K_SPACE),
+)
+
+
+def _write_varint(out, value):
+    """可変長整数（7ビットずつ、下位から）を書き込む
+    
+    Args:
+        out (bytearray): 書き込み先
+        value (int): 0以上の整数
+    """
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos):
+    """可変長整数を読み込む
+    
+    Args:
+        data (bytes): ファイルの内容
+        pos (int): 読み込む位置
+        
+    Returns:
+        tuple: (値, 次の位置)
+        
+    Raises:
+        ValueError: ファイルの途中で終わっている場合
+    """
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("リプレイファイルが途中で終わっています")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, pos
+
+
+def encode(frames, presses=()):
+    """フレームの値の列とキー押下をファイルの内容にする
+    
+    Args:
+        frames (bytes): フレームの値の列
+        presses (list): キー押下のリスト [(フレーム番号, キーの番号), ...]（押した順）
+        
+    Returns:
+        bytes: ファイルの内容
+    """
+    out = bytearray(_HEADER.pack(MAGIC, VERSION, len(frames), len(presses)))
+    
+    # フレームの値はランレングス符号化する
+    i = 0
+    while i < len(frames):
+        value = frames[i]
+        j = i + 1
+        while j < len(frames) and frames[j] == value:
+            j += 1
+        _write_varint(out, j - i)
+        out.append(value)
+        i = j
+        
+    # キー押下は前のキー押下からのフレーム数で書き込む
+    previous = 0
+    for frame, key_id in presses:
+        _write_varint(out, frame - previous)
+        out.append(key_id)
+        previous = frame
+    return bytes(out)
+
+
+def decode(data):
+    """ファイルの内容をフレームの値の列とキー押下に戻す
+    
+    Args:
+        data (bytes): ファイルの内容
+        
+    Returns:
+        tuple: (フレームの値の列(bytes), キー押下のリスト [(フレーム番号, キーの番号), ...])
+        
+    Raises:
+        ValueError: 形式が正しくない場合、ファイルが途中で終わっている場合
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("リプレイファイルが短すぎます")
+    magic, version, count, press_count = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("リプレイファイルの形式が正しくありません")
+    
+    frames = bytearray()
+    pos = _HEADER.size
+    while len(frames) < count:
+        run, pos = _read_varint(data, pos)
+        if pos >= len(data):
+            raise ValueError("リプレイファイルが途中で終わっています")
+        if run == 0 or len(frames) + run > count:
+            raise ValueError("リプレイファイルのフレーム数が一致しません")
+        frames += bytes((data[pos],)) * run
+        pos += 1
+        
+    presses = []
+    frame = 0
+    for _ in range(press_count):
+        delta, pos = _read_varint(data, pos)
+        if pos >= len(data):
+            raise ValueError("リプレイファイルが途中で終わっています")
+        frame += delta
+        key_id = data[pos]
+        pos += 1
+        if frame >= count or key_id >= len(MENU_KEYS):
+            raise ValueError("リプレイファイルのキー押下が正しくありません")
+        presses.append((frame, key_id))
+        
+    if pos != len(data):
+        raise ValueError("リプレイファイルの末尾に余分なデータがあります")
+    return bytes(frames), presses
+
+
+class InputRecorder:
+    """入力記録クラス"""
+    
+    def __init__(self, path):
+        """初期化
+        
+        Args:
+            path (str): 保存先のファイルパス
+        """
+        self.path = path
+        self.frames = bytearray()
+        self.presses = []  # [(フレーム番号, キーの番号), ...]（押した順）
+        
+    def record(self, inputs, pressed_keys):
+        """1フレーム分の入力を記録
+        
+        Args:
+            inputs (int): 押し続けているキーの入力ビット
+            pressed_keys (iterable): そのフレームで押されたキーのリスト（押した順）
+        """
+        frame = len(self.frames)
+        for key in pressed_keys:
+            key_id = _MENU_KEY_IDS.get(key)
+            if key_id is not None:
+                self.presses.append((frame, key_id))
+        self.frames.append(inputs & HELD_MASK)
+        
+    def save(self):
+        """記録した入力をファイルに保存"""
+        with open(self.path, "wb") as f:
+            f.write(encode(self.frames, self.presses))
+
+
+class Replayer:
+    """リプレイクラス"""
+    
+    def __init__(self, path):
+        """初期化
+        
+        Args:
+            path (str): リプレイファイルのパス
+            
+        Raises:
+            ValueError: ファイルの形式が正しくない場合
+        """
+        with open(path, "rb") as f:
+            self.frames, self.presses = decode(f.read())
+            
+    def pressed_keys(self):
+        """フレームごとに押されたキーのリストを取得
+        
+        Returns:
+            list: フレームごとのキーのリスト（押した順）
+        """
+        keys = [[] for _ in self.frames]
+        for frame, key_id in self.presses:
+            keys[frame].append(MENU_KEYS[key_id])
+        return keys
+        
+    def play(self, game, draw=False):
+        """記録した入力をゲームに与えて再生する（実時間の待ち合わせは行わない）
+        
+        Args:
+            game (Game): 再生するゲーム
+            draw (bool): フレームごとに描画するかどうか
+            
+        Returns:
+            int: 再生したフレーム数
+        """
+        for value, keys in zip(self.frames, self.pressed_keys()):
+            self.apply_frame(game, value, keys)
+            game.update()
+            if draw:
+                pygame.event.pump()
+                game.draw()
+        return len(self.frames)
+        
+    @staticmethod
+    def apply_frame(game, value, pressed_keys=()):
+        """1フレーム分の入力をゲームに反映
+        
+        Args:
+            game (Game): 対象のゲーム
+            value (int): フレームの値（押し続けているキーの入力ビット）
+            pressed_keys (iterable): そのフレームで押されたキーのリスト（押した順に処理する）
+        """
+        for key in pressed_keys:
+            game.handle_key_down(key)
+            
+        for bit, key in HELD_KEYS:
+            game.keys[key] = bool(value & bit)
+        game.keys[pygame.K_RSHIFT] = False
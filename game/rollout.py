@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+並列ロールアウトモジュール（複数プロセスでのシミュレーション実行）
+"""
+
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+from game.game_state import GameState
+from game.simulation import Simulation
+
+# 観測値の列（ティックごとに記録する値）
+OBS_PLAYER_X = 0     # プレイヤーのX座標
+OBS_PLAYER_Y = 1     # プレイヤーのY座標
+OBS_PLAYER_STATE = 2 # プレイヤーの状態
+OBS_GAME_STATE = 3   # ゲーム状態
+OBS_SIZE = 4
+
+# 結果の列（エピソードごとに記録する値）
+RESULT_CLEARED = 0     # クリアしたかどうか
+RESULT_LIVES_LOST = 1  # 失った残機数
+RESULT_FRAMES = 2      # 経過ティック数
+RESULT_SIZE = 3
+
+# ワーカープロセス内の状態（プールの初期化時に設定）
+_worker = None
+
+
+class _SharedBuffers:
+    """共有メモリ上の入力・観測・結果バッファ"""
+    
+    def __init__(self, num_envs, max_frames, names=None):
+        """初期化
+        
+        Args:
+            num_envs (int): 環境数
+            max_frames (int): 1エピソードの最大ティック数
+            names (tuple): 既存の共有メモリ名（Noneなら新規に確保する）
+        """
+        self.num_envs = num_envs
+        self.max_frames = max_frames
+        
+        shapes = (
+            ((num_envs, max_frames), np.uint8),
+            ((num_envs, max_frames, OBS_SIZE), np.float32),
+            ((num_envs, RESULT_SIZE), np.int64),
+        )
+        self.memories = []
+        arrays = []
+        for i, (shape, dtype) in enumerate(shapes):
+            size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+            if names is None:
+                memory = shared_memory.SharedMemory(create=True, size=size)
+            else:
+                memory = shared_memory.SharedMemory(name=names[i])
+            self.memories.append(memory)
+            arrays.append(np.ndarray(shape, dtype=dtype, buffer=memory.buf))
+        self.actions, self.observations, self.results = arrays
+        
+    @property
+    def names(self):
+        """共有メモリ名"""
+        return tuple(memory.name for memory in self.memories)
+        
+    def close(self, unlink=False):
+        """共有メモリを閉じる
+        
+        Args:
+            unlink (bool): 共有メモリ自体を解放するかどうか（確保したプロセスのみ）
+        """
+        self.actions = self.observations = self.results = None
+        for memory in self.memories:
+            memory.close()
+            if unlink:
+                memory.unlink()
+        self.memories = []
+
+
+def _init_worker(names, num_envs, max_frames, level):
+    """ワーカープロセスの初期化
+    
+    Args:
+        names (tuple): 共有メモリ名
+        num_envs (int): 環境数
+        max_frames (int): 1エピソードの最大ティック数
+        level (str): レベル名またはJSONファイルのパス（Noneなら標準のレベル）
+    """
+    global _worker
+    _worker = (_SharedBuffers(num_envs, max_frames, names), Simulation(level=level))
+
+
+def _run_shard(shard):
+    """担当する環境のエピソードを実行し、共有メモリに書き込む
+    
+    Args:
+        shard (tuple): (開始番号, 終了番号) 担当する環境の範囲
+        
+    Returns:
+        int: 実行したティック数の合計
+    """
+    buffers, simulation = _worker
+    total = 0
+    for env in range(shard[0], shard[1]):
+        total += _run_episode(simulation, buffers.actions[env], buffers.observations[env],
+                              buffers.results[env])
+    return total
+
+
+def _run_episode(simulation, actions, observations, result):
+    """1エピソードを実行
+    
+    リトライ画面では常にリトライを選び、ゲームオーバーかクリアで終了する。
+    
+    Args:
+        simulation (Simulation): 使い回すシミュレーション
+        actions (numpy.ndarray): ティックごとの入力ビット
+        observations (numpy.ndarray): 観測値の書き込み先
+        result (numpy.ndarray): 結果の書き込み先
+        
+    Returns:
+        int: 経過ティック数
+    """
+    game_state = simulation.game_state
+    player = simulation.player
+    game_state.start_game()
+    simulation.reset_stage()
+    
+    lives_lost = 0
+    frames = 0
+    for inputs in actions.tolist():
+        state = simulation.step(inputs)
+        observations[frames] = (player.rect.x, player.rect.y, player.state, state)
+        frames += 1
+        
+        if state == GameState.RETRY:
+            lives_lost += 1
+            game_state.select_retry(0)
+            game_state.confirm_retry()
+            simulation.reset_stage()
+        elif state == GameState.RESULT:
+            if not game_state.is_cleared:
+                lives_lost += 1
+            break
+            
+    observations[frames:] = 0
+    result[RESULT_CLEARED] = int(game_state.is_cleared)
+    result[RESULT_LIVES_LOST] = lives_lost
+    result[RESULT_FRAMES] = frames
+    return frames
+
+
+class RolloutResult:
+    """ロールアウトの結果"""
+    
+    def __init__(self, results, observations):
+        """初期化
+        
+        Args:
+            results (numpy.ndarray): エピソードごとの結果（環境数 x RESULT_SIZE）
+            observations (numpy.ndarray): ティックごとの観測値（環境数 x ティック数 x OBS_SIZE）
+        """
+        self.cleared = results[:, RESULT_CLEARED].astype(bool)
+        self.lives_lost = results[:, RESULT_LIVES_LOST].copy()
+        self.frames = results[:, RESULT_FRAMES].copy()
+        self.observations = observations
+        
+    def summary(self):
+        """集計結果を取得
+        
+        Returns:
+            dict: エピソード数、クリア率、平均喪失残機数、合計・平均ティック数
+        """
+        episodes = len(self.frames)
+        return {
+            "episodes": episodes,
+            "clear_rate": float(self.cleared.mean()) if episodes else 0.0,
+            "mean_lives_lost": float(self.lives_lost.mean()) if episodes else 0.0,
+            "total_frames": int(self.frames.sum()),
+            "mean_frames": float(self.frames.mean()) if episodes else 0.0,
+        }
+
+
+class RolloutRunner:
+    """並列ロールアウト実行クラス
+    
+    環境（Simulation = Stage + Player + GameState）をワーカープロセスに分担させて
+    エピソードを実行する。入力・観測・結果は共有メモリ上の配列でやり取りし、
+    スプライトなどのオブジェクトはプロセス間で受け渡さない。
+    """
+    
+    def __init__(self, num_envs, max_frames=3600, num_workers=None, level=None):
+        """初期化
+        
+        Args:
+            num_envs (int): 環境数（1回の実行でのエピソード数）
+            max_frames (int): 1エピソードの最大ティック数
+            num_workers (int): ワーカープロセス数（Noneならコア数）
+            level (str): レベル名またはJSONファイルのパス（Noneなら標準のレベル。
+                ワーカープロセスごとに読み込むため、読み込み済みの Level は渡せない）
+        """
+        self.num_envs = num_envs
+        self.max_frames = max_frames
+        self.num_workers = num_workers or multiprocessing.cpu_count()
+        
+        self._buffers = _SharedBuffers(num_envs, max_frames)
+        self._pool = multiprocessing.Pool(
+            self.num_workers, _init_worker,
+            (self._buffers.names, num_envs, max_frames, level))
+            
+        # 負荷の偏りを減らすため、ワーカー数より細かく分割する
+        num_shards = min(num_envs, self.num_workers * 4)
+        bounds = np.linspace(0, num_envs, num_shards + 1).astype(int)
+        self._shards = [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if a < b]
+        
+    def run(self, actions):
+        """全環境で1エピソードずつ実行
+        
+        Args:
+            actions (numpy.ndarray): 入力ビット（環境数 x 最大ティック数、またはブロードキャスト可能な形）
+            
+        Returns:
+            RolloutResult: 実行結果
+        """
+        self._buffers.actions[...] = actions
+        self._pool.map(_run_shard, self._shards)
+        return RolloutResult(self._buffers.results, self._buffers.observations.copy())
+        
+    def close(self):
+        """ワーカープロセスと共有メモリを解放"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+            self._buffers.close(unlink=True)
+            
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+シミュレーションモジュール
+"""
+
+import pygame
+from game.game_state import GameState
+from game.player import Player
+from game.profiler import NULL_PROFILER
+from game.snapshot import Snapshot
+from game.stage import Stage
+
+class Simulation:
+    """ゲームロジックのシミュレーションクラス
+    
+    画面・音声・フレームレート制御を持たず、入力を1ティックずつ与えて
+    プレイヤー・ステージ・敵の状態を進める。
+    """
+    
+    # 入力ビット（stepに渡す入力はこれらの論理和）
+    INPUT_LEFT = 1    # 左移動
+    INPUT_RIGHT = 2   # 右移動
+    INPUT_DASH = 4    # ダッシュ
+    INPUT_JUMP = 8    # ジャンプ
+    
+    # イベント（step で起きた出来事。効果音の再生などに使う）
+    EVENT_STOMP = 0      # 敵を踏んで倒した
+    EVENT_DAMAGE = 1     # 敵に当たってダメージを受けた
+    EVENT_LOSE_LIFE = 2  # 穴に落ちて残機が減った
+    EVENT_CLEAR = 3      # ゴールした
+    
+    def __init__(self, screen_width=800, screen_height=600, use_checkpoints=False,
+                 level=None, stage=None, enemy_lod=True, game_state=None):
+        """初期化
+        
+        Args:
+            screen_width (int): 画面の幅（カメラの計算に使用）
+            screen_height (int): 画面の高さ（落下判定に使用）
+            use_checkpoints (bool): ステージの中間地点を通過したときにチェックポイントを記録するかどうか
+            level (str): レベル名またはJSONファイルのパス（Noneなら標準のレベル）
+            stage (Stage): 作成済みのステージ（StreamingStage など。指定した場合は level は使わない）
+            enemy_lod (bool): 画面から離れた敵の更新を省略するかどうか（結果は省略しない場合と同じ）
+            game_state (GameState): 作成済みのゲーム状態（Noneなら新しく作成する）
+        """
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        
+        # ゲーム状態
+        self.game_state = game_state if game_state is not None else GameState()
+        
+        # ステージ
+        self.stage = stage if stage is not None else Stage(height=screen_height, level=level)
+        if enemy_lod:
+            self.stage.enable_enemy_lod(screen_width)
+        
+        # プレイヤー
+        start_pos = self.stage.get_start_position()
+        self.player = Player(start_pos[0], start_pos[1])
+        
+        # カメラオフセット（スクロール用）
+        self.camera_offset_x = 0
+        
+        # 経過ティック数
+        self.frame = 0
+        
+        # 直前の step で起きたイベントのリスト（EVENT_*）
+        self.events = []
+        
+        # チェックポイント（最後に通過した中間地点でのスナップショット）
+        self.use_checkpoints = use_checkpoints
+        self.checkpoint = None
+        self._next_checkpoint = 0  # 次に通過する中間地点の番号
+        
+        # 処理時間の計測（計測しない場合は NULL_PROFILER）
+        self.profiler = NULL_PROFILER
+        
+    def start(self):
+        """ゲームを開始する"""
+        self.game_state.start_game()
+        
+    def respawn(self):
+        """プレイヤーとカメラをスタート位置に戻す"""
+        start_pos = self.stage.get_start_position()
+        self.player.reset_position(start_pos[0], start_pos[1])
+        self.camera_offset_x = 0
+        
+    def reset_stage(self, use_checkpoint=False):
+        """ステージをリセットし、プレイヤーをスタート位置に戻す
+        
+        Args:
+            use_checkpoint (bool): チェックポイントがあればそこから再開するかどうか
+                （Falseの場合はチェックポイントも破棄する）
+        """
+        if use_checkpoint and self.checkpoint is not None:
+            self.checkpoint.restore(self, game_state=False)
+            return
+            
+        self.checkpoint = None
+        self._next_checkpoint = 0
+        self.stage.reset()
+        self.respawn()
+        
+    def snapshot(self):
+        """現在の状態のスナップショットを取得
+        
+        Returns:
+            Snapshot: スナップショット
+        """
+        return Snapshot.capture(self)
+        
+    def restore(self, snapshot):
+        """スナップショットの状態に戻す
+        
+        Args:
+            snapshot (Snapshot): snapshot() で取得したスナップショット
+        """
+        snapshot.restore(self)
+        
+    def step(self, inputs):
+        """1ティック進める
+        
+        Args:
+            inputs (int): 入力ビットの論理和
+            
+        Returns:
+            int: 更新後のゲーム状態
+        """
+        self.events = []
+        if self.game_state.state == GameState.PLAYING:
+            # プレイヤーの入力処理
+            is_dashing = bool(inputs & self.INPUT_DASH)
+            
+            if inputs & self.INPUT_LEFT:
+                self.player.move_left(is_dashing)
+            elif inputs & self.INPUT_RIGHT:
+                self.player.move_right(is_dashing)
+            else:
+                self.player.stop()
+                
+            if inputs & self.INPUT_JUMP:
+                self.player.jump()
+                
+            profiler = self.profiler
+            
+            # プレイヤーの更新
+            with profiler.section("update.player"):
+                self.player.update(self.stage.block_grid)
+                
+            # ステージの更新
+            with profiler.section("update.stage"):
+                self.stage.update(self.camera_offset_x, self.player.rect)
+                
+            # カメラのスクロール
+            with profiler.section("update.camera"):
+                self._update_camera()
+                
+            # 衝突判定
+            with profiler.section("update.collisions"):
+                self._check_collisions(is_dashing)
+                
+            if self.use_checkpoints:
+                self._update_checkpoint()
+                
+        self.frame += 1
+        return self.game_state.state
+        
+    def run(self, input_sequence):
+        """入力列を与えて連続して進める
+        
+        プレイ中でなくなった時点で停止する。
+        
+        Args:
+            input_sequence (iterable): ティックごとの入力ビットの列
+            
+        Returns:
+            int: 進めたティック数
+        """
+        ticks = 0
+        for inputs in input_sequence:
+            if self.game_state.state != GameState.PLAYING:
+                break
+            self.step(inputs)
+            ticks += 1
+        return ticks
+        
+    def _update_camera(self):
+        """カメラ位置の更新"""
+        # プレイヤーが画面中央より右にいる場合、カメラを追従させる
+        player_screen_x = self.player.rect.x - self.camera_offset_x
+        if player_screen_x > self.screen_width // 2:
+            self.camera_offset_x = self.player.rect.x - self.screen_width // 2
+            
+        # カメラが左端より左に行かないようにする
+        if self.camera_offset_x < 0:
+            self.camera_offset_x = 0
+            
+        # カメラが右端より右に行かないようにする
+        max_offset = self.stage.width - self.screen_width
+        if self.camera_offset_x > max_offset:
+            self.camera_offset_x = max_offset
+            
+    def _update_checkpoint(self):
+        """中間地点に着地したらチェックポイントを記録"""
+        checkpoints = self.stage.checkpoints
+        if (self._next_checkpoint < len(checkpoints)
+                and self.game_state.state == GameState.PLAYING
+                and self.player.state == self.player.STANDING
+                and self.player.rect.x >= checkpoints[self._next_checkpoint]):
+            self.checkpoint = self.snapshot()
+            self._next_checkpoint += 1
+            
+    def _check_collisions(self, is_dashing):
+        """衝突判定
+        
+        Args:
+            is_dashing (bool): ダッシュ入力中かどうか
+        """
+        # 敵との衝突判定（矩形が重なる候補だけを空間インデックスから取り出して判定する）
+        for enemy in self.stage.enemy_broadphase.query(self.player.rect):
+            collision_type = enemy.check_collision_with_player(self.player)
+            
+            if collision_type == 1:  # 上からの衝突
+                enemy.defeat()
+                self.events.append(self.EVENT_STOMP)
+                # ダッシュ入力中は通常ジャンプと同じ勢いで跳ね返る
+                if is_dashing:
+                    self.player.vel_y = -self.player.JUMP_POWER  # 通常ジャンプと同じ勢い
+                else:
+                    self.player.vel_y = -10  # 通常の跳ね返り
+            elif collision_type == 2:  # その他の衝突（ダメージ）
+                # プレイヤーをダメージ状態にする
+                if self.player.state != self.player.DAMAGED:
+                    self.events.append(self.EVENT_DAMAGE)
+                self.player.take_damage()
+                
+        # 穴に落ちた判定またはダメージ状態で画面外に出た判定
+        if self.player.rect.y > self.screen_height:
+            self.game_state.lose_life()
+            self.events.append(self.EVENT_LOSE_LIFE)
+            if self.game_state.state == GameState.PLAYING:
+                # まだ残機がある場合は位置をリセット
+                self.respawn()
+                
+        # ゴールとの衝突判定（ゴールのチャンクが読み込まれていない場合は判定しない）
+        goal = self.stage.goal
+        if goal is not None and pygame.sprite.collide_rect(self.player, goal):
+            self.game_state.clear_game()
+            self.events.append(self.EVENT_CLEAR)
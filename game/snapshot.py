@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+スナップショットモジュール（ゲーム全体の状態の保存と復元）
+"""
+
+
+class Snapshot:
+    """ゲーム全体の状態のスナップショット
+    
+    プレイヤー・敵・ゲーム状態・カメラ位置の値だけを持ち、Surfaceやスプライトは持たない。
+    ブロックは変化しないため含めない。敵の状態は Stage.capture_enemies で記録する
+    （敵のLODが有効なら画面の近くの敵の値だけを持ち、眠っている敵は起こさない）。
+    """
+    
+    __slots__ = ("frame", "camera_offset_x", "game_state", "player", "enemies")
+    
+    def __init__(self, frame, camera_offset_x, game_state, player, enemies):
+        """初期化
+        
+        Args:
+            frame (int): 経過ティック数
+            camera_offset_x (int): カメラオフセット
+            game_state (tuple): (state, lives, is_cleared, retry_selection)
+            player (tuple): (rect.x, rect.y, float_x, float_y, vel_x, vel_y, state)
+            enemies (tuple): Stage.capture_enemies の戻り値
+        """
+        self.frame = frame
+        self.camera_offset_x = camera_offset_x
+        self.game_state = game_state
+        self.player = player
+        self.enemies = enemies
+        
+    @classmethod
+    def capture(cls, simulation):
+        """シミュレーションの現在の状態を記録
+        
+        Args:
+            simulation (Simulation): 対象のシミュレーション
+            
+        Returns:
+            Snapshot: スナップショット
+        """
+        game_state = simulation.game_state
+        player = simulation.player
+        return cls(
+            simulation.frame,
+            simulation.camera_offset_x,
+            (game_state.state, game_state.lives, game_state.is_cleared, game_state.retry_selection),
+            (player.rect.x, player.rect.y, player.float_x, player.float_y,
+             player.vel_x, player.vel_y, player.state),
+            simulation.stage.capture_enemies(),
+        )
+        
+    def restore(self, simulation, game_state=True):
+        """シミュレーションを記録した状態に戻す（ステージは作り直さない）
+        
+        Args:
+            simulation (Simulation): 対象のシミュレーション（記録したものと同じステージ）
+            game_state (bool): ゲーム状態（画面・残機など）も戻すかどうか
+        """
+        simulation.frame = self.frame
+        simulation.camera_offset_x = self.camera_offset_x
+        
+        if game_state:
+            state = simulation.game_state
+            state.state, state.lives, state.is_cleared, state.retry_selection = self.game_state
+            
+        player = simulation.player
+        (player.rect.x, player.rect.y, player.float_x, player.float_y,
+         player.vel_x, player.vel_y, player.state) = self.player
+        
+        simulation.stage.restore_enemies(self.enemies, self.camera_offset_x, player.rect)
+
+
+class SnapshotRing:
+    """直近のスナップショットを保持するリングバッファ
+    
+    容量を超えると最も古いものから上書きするため、メモリ使用量は一定に収まる。
+    """
+    
+    def __init__(self, capacity):
+        """初期化
+        
+        Args:
+            capacity (int): 保持するスナップショットの最大数
+        """
+        self.capacity = capacity
+        self._items = [None] * capacity
+        self._head = 0   # 次に書き込む位置
+        self._count = 0
+        
+    def __len__(self):
+        return self._count
+        
+    def push(self, snapshot):
+        """スナップショットを追加
+        
+        Args:
+            snapshot (Snapshot): 追加するスナップショット
+        """
+        self._items[self._head] = snapshot
+        self._head = (self._head + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+            
+    def pop(self):
+        """最も新しいスナップショットを取り出す
+        
+        Returns:
+            Snapshot: スナップショット（空の場合はNone）
+        """
+        if self._count == 0:
+            return None
+        self._head = (self._head - 1) % self.capacity
+        snapshot = self._items[self._head]
+        self._items[self._head] = None
+        self._count -= 1
+        return snapshot
+        
+    def clear(self):
+        """全てのスナップショットを破棄"""
+        self._items = [None] * self.capacity
+        self._head = 0
+        self._count = 0
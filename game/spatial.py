@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+空間インデックスモジュール
+"""
+
+from bisect import bisect_left, bisect_right
+from operator import attrgetter
+
+# ソートのキー（矩形の左端のX座標）
+_rect_left = attrgetter("rect.left")
+
+
+class SpatialGrid:
+    """一様グリッドによる空間インデックス
+    
+    矩形（rect属性）を持つオブジェクトを固定サイズのセルに登録し、
+    指定した矩形の近くのセルだけを調べて衝突判定を行う。
+    """
+    
+    def __init__(self, cell_size=100):
+        """初期化
+        
+        Args:
+            cell_size (int): セル1つの一辺の長さ（ピクセル）
+        """
+        self.cell_size = cell_size
+        
+        # セル座標 -> 登録オブジェクトのリスト
+        self.cells = {}
+        
+        # 登録オブジェクト -> 登録順（衝突結果の並び順を登録順に揃えるため）
+        self._order = {}
+        self._next_order = 0
+        
+    def _cell_range(self, rect):
+        """矩形が重なるセル範囲を取得
+        
+        Args:
+            rect (pygame.Rect): 対象の矩形
+            
+        Returns:
+            tuple: (x0, x1, y0, y1) セル座標の範囲（両端を含む）
+        """
+        size = self.cell_size
+        return (rect.left // size, (rect.right - 1) // size,
+                rect.top // size, (rect.bottom - 1) // size)
+                
+    def add(self, item):
+        """オブジェクトを登録
+        
+        Args:
+            item: rect属性を持つオブジェクト
+        """
+        self._order[item] = self._next_order
+        self._next_order += 1
+        
+        x0, x1, y0, y1 = self._cell_range(item.rect)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self.cells.setdefault((cx, cy), []).append(item)
+                
+    def remove(self, item):
+        """オブジェクトの登録を削除（空になったセルも削除する）
+        
+        Args:
+            item: add() で登録したオブジェクト（登録時から矩形が変わっていないこと）
+        """
+        del self._order[item]
+        
+        x0, x1, y0, y1 = self._cell_range(item.rect)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self.cells[(cx, cy)]
+                cell.remove(item)
+                if not cell:
+                    del self.cells[(cx, cy)]
+                    
+    def clear(self):
+        """登録をすべて削除"""
+        self.cells.clear()
+        self._order.clear()
+        self._next_order = 0
+        
+    def query(self, rect):
+        """矩形と衝突するオブジェクトを取得
+        
+        Args:
+            rect (pygame.Rect): 判定する矩形
+            
+        Returns:
+            list: 衝突したオブジェクトのリスト（登録順）
+        """
+        found = {}
+        x0, x1, y0, y1 = self._cell_range(rect)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                for item in self.cells.get((cx, cy), ()):
+                    if item not in found and rect.colliderect(item.rect):
+                        found[item] = self._order[item]
+                        
+        if len(found) < 2:
+            return list(found)
+        return sorted(found, key=found.get)
+        
+    def spritecollide(self, sprite):
+        """スプライトと衝突するオブジェクトを取得
+        
+        pygame.sprite.spritecollide(sprite, group, False) と同じ結果を返す。
+        
+        Args:
+            sprite (pygame.sprite.Sprite): 判定するスプライト
+            
+        Returns:
+            list: 衝突したオブジェクトのリスト（登録順）
+        """
+        return self.query(sprite.rect)
+        
+    def __len__(self):
+        """登録数"""
+        return len(self._order)
+        
+    def __contains__(self, item):
+        """登録済みかどうか"""
+        return item in self._order
+        
+    def __iter__(self):
+        """登録順に列挙"""
+        return iter(self._order)
+
+
+class SweepAndPrune:
+    """X方向のソート済みリストによる動くオブジェクトの空間インデックス（スイープ・アンド・プルーン）
+    
+    登録オブジェクトを矩形の左端の順に並べておき、判定する矩形とX方向の範囲が重なる区間だけを
+    二分探索で取り出して衝突判定を行う。動いたオブジェクトは move() でその位置だけを並べ直す。
+    """
+    
+    # 動いたオブジェクトが登録数のこの割合（1/RESORT_RATIO）以上なら全体をソートし直す
+    RESORT_RATIO = 8
+    
+    def __init__(self):
+        """初期化"""
+        # 左端のX座標の昇順に並べたオブジェクトと、その左端のX座標
+        self._items = []
+        self._lefts = []
+        
+        # 登録オブジェクト -> 並べたときの左端のX座標
+        self._keys = {}
+        
+        # 登録オブジェクト -> 登録順（衝突結果の並び順を登録順に揃えるため）
+        self._order = {}
+        self._next_order = 0
+        
+        # 登録したオブジェクトの幅の最大値（検索範囲の計算に使う）
+        self._max_width = 0
+        
+    def add(self, item):
+        """オブジェクトを登録
+        
+        Args:
+            item: rect属性を持つオブジェクト
+        """
+        self._order[item] = self._next_order
+        self._next_order += 1
+        self._max_width = max(self._max_width, item.rect.width)
+        self._insert(item, item.rect.left)
+        
+    def remove(self, item):
+        """オブジェクトの登録を削除
+        
+        Args:
+            item: add() で登録したオブジェクト
+        """
+        index = self._index(item)
+        del self._items[index]
+        del self._lefts[index]
+        del self._keys[item]
+        del self._order[item]
+        
+    def move(self, item):
+        """動いたオブジェクトを並べ直す
+        
+        Args:
+            item: add() で登録したオブジェクト（矩形を変更した後に呼ぶ）
+        """
+        left = item.rect.left
+        if self._keys[item] == left:
+            return
+        index = self._index(item)
+        del self._items[index]
+        del self._lefts[index]
+        self._max_width = max(self._max_width, item.rect.width)
+        self._insert(item, left)
+        
+    def update(self, sprites):
+        """動いた可能性のあるスプライトを並べ直す（グループから削除されたスプライトは登録も削除する）
+        
+        動いたスプライトが多い場合は、1つずつ並べ直す代わりに全体をソートし直す
+        （ほぼ整列済みのリストのソートは線形時間で済む）。
+        
+        Args:
+            sprites (iterable): 登録済みのスプライト
+            
+        Returns:
+            list: 登録を削除したスプライトのリスト
+        """
+        sprites = [sprite for sprite in sprites if sprite in self._keys]
+        removed = [sprite for sprite in sprites if not sprite.alive()]
+        for sprite in removed:
+            self.remove(sprite)
+            
+        if len(sprites) * self.RESORT_RATIO < len(self._items):
+            if removed:
+                sprites = [sprite for sprite in sprites if sprite in self._keys]
+            for sprite in sprites:
+                self.move(sprite)
+            return removed
+            
+        items = self._items
+        items.sort(key=_rect_left)
+        self._lefts = list(map(_rect_left, items))
+        self._keys = dict(zip(items, self._lefts))
+        return removed
+        
+    def clear(self):
+        """登録をすべて削除"""
+        self._items.clear()
+        self._lefts.clear()
+        self._keys.clear()
+        self._order.clear()
+        self._next_order = 0
+        self._max_width = 0
+        
+    def _insert(self, item, left):
+        """左端のX座標の順を保つ位置にオブジェクトを挿入
+        
+        Args:
+            item: 挿入するオブジェクト
+            left (int): 左端のX座標
+        """
+        index = bisect_right(self._lefts, left)
+        self._items.insert(index, item)
+        self._lefts.insert(index, left)
+        self._keys[item] = left
+        
+    def _index(self, item):
+        """並べたリストでのオブジェクトの位置を取得
+        
+        Args:
+            item: 登録済みのオブジェクト
+            
+        Returns:
+            int: 位置
+        """
+        index = bisect_left(self._lefts, self._keys[item])
+        items = self._items
+        while items[index] is not item:
+            index += 1
+        return index
+        
+    def query(self, rect):
+        """矩形と衝突するオブジェクトを取得
+        
+        Args:
+            rect (pygame.Rect): 判定する矩形
+            
+        Returns:
+            list: 衝突したオブジェクトのリスト（登録順）
+        """
+        # 左端が (rect.left - 最大幅, rect.right) の範囲にあるものだけが重なり得る
+        lefts = self._lefts
+        start = bisect_right(lefts, rect.left - self._max_width)
+        end = bisect_left(lefts, rect.right, start)
+        found = [item for item in self._items[start:end] if rect.colliderect(item.rect)]
+        
+        if len(found) < 2:
+            return found
+        return sorted(found, key=self._order.__getitem__)
+        
+    def __len__(self):
+        """登録数"""
+        return len(self._order)
+        
+    def __contains__(self, item):
+        """登録済みかどうか"""
+        return item in self._order
+        
+    def __iter__(self):
+        """登録順に列挙"""
+        return iter(self._order)
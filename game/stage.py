@@ -5,11 +5,23 @@
 ステージモジュール
 """
 
+from array import array
 import pygame
+from game.atlas import solid_image
 from game.enemy import Enemy
+from game.entity import Entity, EntityGroup
+from game.level import Level, load_level
+from game.lod import EnemyLOD
+from game.spatial import SpatialGrid, SweepAndPrune
+from game.tilemap import TileMap
 
-class Block(pygame.sprite.Sprite):
-    """ブロッククラス"""
+# 記録する敵1体あたりの値の数（rect.x, rect.y, float_x, float_y, direction, state）
+_ENEMY_FIELDS = 6
+
+class Block(Entity):
+    """ブロッククラス（軽量エンティティ）"""
+    
+    __slots__ = ("_image",)
     
     def __init__(self, x, y, width, height):
         """初期化
@@ -20,16 +32,19 @@ class Block(pygame.sprite.Sprite):
             width (int): 幅
             height (int): 高さ
         """
-        super().__init__()
+        super().__init__(pygame.Rect(x, y, width, height))
         
-        # ブロックの画像を作成
-        self.image = pygame.Surface((width, height))
-        self.image.fill((100, 100, 100))  # グレー
-        self.rect = self.image.get_rect()
+        # 描画用の画像（最初に描画するときに取得する）
+        self._image = None
         
-        # 位置を設定
-        self.rect.x = x
-        self.rect.y = y
+    @property
+    def image(self):
+        """描画用の画像（同じ大きさのブロックで共有する）"""
+        image = self._image
+        if image is None:
+            # 画面が作成された後の最初の描画で取得し、以降はアトラスを引かない
+            image = self._image = solid_image(self.rect.width, self.rect.height, (100, 100, 100))  # グレー
+        return image
 
 
 class Goal(pygame.sprite.Sprite):
@@ -44,9 +59,8 @@ class Goal(pygame.sprite.Sprite):
         """
         super().__init__()
         
-        # ゴールの画像を作成
-        self.image = pygame.Surface((50, 80))
-        self.image.fill((0, 255, 0))  # 緑色
+        # ゴールの画像
+        self.image = solid_image(50, 80, (0, 255, 0))  # 緑色
         self.rect = self.image.get_rect()
         
         # 位置を設定
@@ -55,87 +69,255 @@ class Goal(pygame.sprite.Sprite):
 
 
 class Stage:
-    """ステージクラス"""
+    """ステージクラス
     
-    def __init__(self, width, height):
+    レベルデータの全てのブロックと敵を作成時にまとめて作成する。
+    敵の初期配置の順序（衝突判定の順序）、スナップショット、敵のLODはステージ全体の敵を前提とするため、
+    領域ごとに遅れて作成することはしない。ステージの長さによらず処理量を一定にしたい場合は
+    チャンク単位で作成する StreamingStage を使う。
+    """
+    
+    # 空間インデックスのセルサイズ
+    GRID_CELL_SIZE = 100
+    
+    # タイルの一辺の長さ
+    TILE_SIZE = 50
+    
+    # レベルを指定しない場合に読み込むレベル
+    DEFAULT_LEVEL = "level1"
+    
+    # 敵のLODで敵を眠らせる距離（画面端からのピクセル数）
+    ENEMY_LOD_MARGIN = 200
+    
+    def __init__(self, width=None, height=600, level=None):
         """初期化
         
         Args:
-            width (int): ステージの幅
+            width (int): ステージの幅（レベルデータから作成する場合は使わず、レベルの幅になる）
             height (int): ステージの高さ
+            level (str or Level): レベル名（game/levels 内のファイル名）、JSONファイルのパス、
+                または読み込み済みのレベル（Noneなら DEFAULT_LEVEL）
         """
         self.width = width
         self.height = height
+        self.level = level
         
-        # スプライトグループ
-        self.blocks = pygame.sprite.Group()
-        self.enemies = pygame.sprite.Group()
+        # ブロック・敵のグループ（軽量エンティティ）とゴール
+        self.blocks = EntityGroup()
+        self.enemies = EntityGroup()
         self.goal = None
         
+        # 地形のタイルマップ（最初に参照したときに作成する）
+        self._tilemap = None
+        
+        # ブロックの空間インデックス（衝突判定用）
+        self.block_grid = SpatialGrid(self.GRID_CELL_SIZE)
+        
+        # 敵の空間インデックス（プレイヤーとの衝突判定の候補を絞り込む）
+        self.enemy_broadphase = SweepAndPrune()
+        
         # スタート位置
         self.start_x = 100
         self.start_y = 400
         
+        # 中間地点のX座標（左から順。通過するとチェックポイントになる）
+        self.checkpoints = []
+        
+        # 画面から離れた敵の更新の省略（enable_enemy_lod で有効にする）
+        self.enemy_lod = None
+        
+        # リセット後に倒されてグループから消えた敵と、スナップショットと共有するその複製
+        # （複製は倒された敵が増えた後の最初の記録で作り直す。Noneなら作り直しが必要）
+        self._defeated = set()
+        self._defeated_copy = frozenset()
+        
         # ステージを作成
         self._create_stage()
         
+        # 敵の初期配置（リセット時に復元する）
+        self._initial_enemies = [(enemy, enemy.rect.x, enemy.rect.y) for enemy in self.enemies]
+        self._build_enemy_broadphase()
+        
+    @property
+    def tilemap(self):
+        """地形のタイルマップ（レベルから作成した場合はブロックの矩形から復元する）"""
+        if self._tilemap is None:
+            self._tilemap = TileMap(self.width, self.height, self.TILE_SIZE)
+            if isinstance(self.level, Level):
+                for x, y, width, height in self.level.iter_rects():
+                    self._tilemap.fill_rect(x, y, width, height)
+        return self._tilemap
+        
     def _create_stage(self):
-        """ステージを作成"""
-        # 地面
-        ground_y = 500
-        
-        # 左端の地面
-        for x in range(0, 800, 50):
-            self.blocks.add(Block(x, ground_y, 50, 50))
-        
-        # 穴（幅200px - ダッシュジャンプで渡れる）
-        for x in range(800, 1000, 50):
-            pass  # 穴なので何も配置しない
-        
-        # 中央の地面
-        for x in range(1000, 1800, 50):
-            self.blocks.add(Block(x, ground_y, 50, 50))
-        
-        # 穴（幅200px - ダッシュジャンプで渡れる）
-        for x in range(1800, 2000, 50):
-            pass
-        
-        # 右端の地面
-        for x in range(2000, 3000, 50):
-            self.blocks.add(Block(x, ground_y, 50, 50))
-        
-        # 障害物（ブロック）
-        self.blocks.add(Block(500, ground_y - 100, 50, 100))
-        self.blocks.add(Block(700, ground_y - 150, 50, 150))
-        self.blocks.add(Block(1200, ground_y - 100, 50, 100))
-        self.blocks.add(Block(1400, ground_y - 150, 50, 150))
-        self.blocks.add(Block(1600, ground_y - 100, 50, 100))
-        self.blocks.add(Block(2200, ground_y - 100, 50, 100))
-        self.blocks.add(Block(2400, ground_y - 150, 50, 150))
+        """レベルデータからステージを作成"""
+        if not isinstance(self.level, Level):
+            self.level = load_level(self.level or self.DEFAULT_LEVEL)
+        level = self.level
+        self.width = level.width
         
-        # 敵
-        self.enemies.add(Enemy(600, ground_y - 30))
-        self.enemies.add(Enemy(1300, ground_y - 30))
-        self.enemies.add(Enemy(1700, ground_y - 30))
-        self.enemies.add(Enemy(2300, ground_y - 30))
+        # スタート位置と中間地点
+        self.start_x, self.start_y = level.start
+        self.checkpoints = level.checkpoints.tolist()
         
+        # ブロック（連続したタイルをまとめた矩形ごと）
+        for x, y, width, height in level.iter_rects():
+            self.blocks.add(Block(x, y, width, height))
+            
+        # 敵
+        for x, y in level.iter_enemies():
+            self.enemies.add(Enemy(x, y))
+            
         # ゴール
-        self.goal = Goal(2800, ground_y - 80)
+        if level.goal is not None:
+            self.goal = Goal(*level.goal)
+            
+        # ブロックの空間インデックスを構築
+        self._build_block_grid()
+        
+    def _build_block_grid(self):
+        """ブロックの空間インデックスを構築"""
+        self.block_grid.clear()
+        for block in self.blocks:
+            self.block_grid.add(block)
         
-    def update(self):
-        """ステージの状態を更新"""
+    def _build_enemy_broadphase(self):
+        """敵の空間インデックスをグループの順に構築"""
+        self.enemy_broadphase.clear()
+        for enemy in self.enemies:
+            self.enemy_broadphase.add(enemy)
+            
+    def enable_enemy_lod(self, view_width, margin=None):
+        """画面から離れた敵の更新の省略を有効にする
+        
+        Args:
+            view_width (int): 画面の幅
+            margin (int): 画面端から敵を眠らせるまでの距離（Noneなら ENEMY_LOD_MARGIN）
+        """
+        if margin is None:
+            margin = self.ENEMY_LOD_MARGIN
+        self.enemy_lod = EnemyLOD(self, view_width, margin)
+        
+    def update(self, camera_offset_x=0, focus_rect=None):
+        """ステージの状態を更新
+        
+        Args:
+            camera_offset_x (int): カメラのXオフセット（敵のLODとチャンクを読み込むステージで使用）
+            focus_rect (pygame.Rect): 画面外でも敵を通常どおり更新する範囲（プレイヤーの矩形など）
+        """
         # 敵の更新
-        self.enemies.update(self.blocks)
+        if self.enemy_lod is not None:
+            moved = self.enemy_lod.update(camera_offset_x, focus_rect)
+        else:
+            moved = list(self.enemies)
+            self.enemies.update(self.block_grid)
+            
+        # 動いた敵を空間インデックスで並べ直す
+        removed = self.enemy_broadphase.update(moved)
+        if removed:
+            self._defeated.update(removed)
+            self._defeated_copy = None
+        
+    def sync_enemies(self, camera_offset_x=None, focus_rect=None):
+        """眠っている敵の位置を現在のティックに合わせる（敵の状態を読み出す前に呼ぶ）
+        
+        Args:
+            camera_offset_x (int): カメラのXオフセット（指定すると画面の近くの敵だけを合わせる）
+            focus_rect (pygame.Rect): 画面外でも合わせる範囲
+        """
+        if self.enemy_lod is not None:
+            self.enemy_broadphase.update(self.enemy_lod.sync(camera_offset_x, focus_rect))
+            
+    def refresh_enemies(self):
+        """敵の状態を外から書き換えた後に、空間インデックスを作り直し全ての敵を通常の更新に戻す"""
+        self._build_enemy_broadphase()
+        if self.enemy_lod is not None:
+            self.enemy_lod.wake_all()
+            
+    def capture_enemies(self):
+        """敵の状態を記録（Snapshot が使う）
+        
+        敵のLODが有効な場合は起きている敵の値だけを記録し、眠っている敵は EnemyLOD の
+        辞書を参照するだけにする（起こさず、変化がなければ複製もしない）。倒された敵の集合も
+        変化がなければ前回の記録と共有する。
+        そのため記録にかかる時間とメモリは、ステージ全体ではなく画面の近くの敵の数に比例する。
+        
+        Returns:
+            tuple: restore_enemies に渡す値（内容はステージの内部表現）
+        """
+        if self.enemy_lod is not None:
+            tick, awake, sleepers = self.enemy_lod.capture()
+        else:
+            tick, awake, sleepers = None, tuple(self.enemies), None
+            
+        values = array("d")
+        for enemy in awake:
+            rect = enemy.rect
+            values.extend((rect.x, rect.y, enemy.float_x, enemy.float_y, enemy.direction, enemy.state))
+        if self._defeated_copy is None:
+            self._defeated_copy = frozenset(self._defeated)
+        return (tick, awake, values, sleepers, self._defeated_copy)
+        
+    def restore_enemies(self, state, camera_offset_x=0, focus_rect=None):
+        """capture_enemies で記録した状態に戻す
+        
+        Args:
+            state (tuple): capture_enemies の戻り値
+            camera_offset_x (int): 戻した後のカメラのXオフセット
+            focus_rect (pygame.Rect): 画面外でも敵を起こしておく範囲（プレイヤーの矩形など）
+        """
+        tick, awake, values, sleepers, defeated = state
+        
+        # 倒された敵が違う場合は、グループと空間インデックスを初期配置の順に作り直す
+        if defeated is not self._defeated_copy:
+            self._defeated = set(defeated)
+            self._defeated_copy = defeated
+            self.enemies.empty()
+            for enemy, _, _ in self._initial_enemies:
+                if enemy not in defeated:
+                    self.enemies.add(enemy)
+            self._build_enemy_broadphase()
+            
+        for i, enemy in enumerate(awake):
+            base = i * _ENEMY_FIELDS
+            enemy.rect.x = int(values[base])
+            enemy.rect.y = int(values[base + 1])
+            enemy.float_x = values[base + 2]
+            enemy.float_y = values[base + 3]
+            enemy.direction = int(values[base + 4])
+            enemy.state = int(values[base + 5])
+            
+        moved = list(awake)
+        if self.enemy_lod is not None:
+            moved += self.enemy_lod.restore(tick, awake, sleepers, camera_offset_x, focus_rect)
+        self.enemy_broadphase.update(moved)
         
     def reset(self):
-        """ステージをリセット"""
-        # 既存のスプライトをクリア
-        self.blocks.empty()
+        """ステージをリセット
+        
+        ブロック・ゴール・空間インデックスは変化しないためそのまま使い、
+        敵だけを初期配置に戻す（倒された敵も元の順番で復活させる）。
+        """
         self.enemies.empty()
-        self.goal = None
+        for enemy, x, y in self._initial_enemies:
+            enemy.reset_position(x, y)
+            self.enemies.add(enemy)
+        self._clear_defeated()
+        self.refresh_enemies()
         
-        # ステージを再作成
-        self._create_stage()
+    def _clear_defeated(self):
+        """倒された敵の記録を消す（ステージのリセット時に呼ぶ）"""
+        self._defeated = set()
+        self._defeated_copy = frozenset()
+        
+    def _forget_defeated(self, enemies):
+        """倒された敵の記録から、ステージから取り除いた敵を消す
+        
+        Args:
+            enemies (list): 取り除いた敵のリスト
+        """
+        if not self._defeated.isdisjoint(enemies):
+            self._defeated.difference_update(enemies)
+            self._defeated_copy = None
         
     def get_start_position(self):
         """スタート位置を取得
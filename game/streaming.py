@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ストリーミングステージモジュール（長いステージをチャンク単位で読み込む）
+"""
+
+import random
+from game.enemy import Enemy
+from game.stage import Block, Goal, Stage
+
+
+class Chunk:
+    """チャンク1つ分のステージデータ"""
+    
+    __slots__ = ("rects", "enemies", "goal")
+    
+    def __init__(self, rects, enemies, goal=None):
+        """初期化
+        
+        Args:
+            rects (list): ブロックの矩形 [(x, y, width, height), ...]
+            enemies (list): 敵の初期位置 [(x, y), ...]
+            goal (tuple): ゴールの位置 (x, y)（このチャンクに無ければNone）
+        """
+        self.rects = rects
+        self.enemies = enemies
+        self.goal = goal
+
+
+class LevelChunkSource:
+    """レベルデータをチャンクに分割して供給するクラス
+    
+    チャンクの境界をまたぐブロックは境界で分割する。
+    """
+    
+    def __init__(self, level, chunk_width):
+        """初期化
+        
+        Args:
+            level (Level): 読み込み済みのレベル
+            chunk_width (int): チャンク1つの幅（ピクセル）
+        """
+        self.level = level
+        self.chunk_width = chunk_width
+        self.width = level.width
+        self.start = level.start
+        self.checkpoints = level.checkpoints.tolist()
+        
+        # チャンク番号 -> ブロック・敵の番号（レベルデータはコピーせず番号だけ持つ）
+        self._rect_index = {}
+        for i, (x, _, width, _) in enumerate(level.iter_rects()):
+            for index in range(x // chunk_width, (x + width - 1) // chunk_width + 1):
+                self._rect_index.setdefault(index, []).append(i)
+        self._enemy_index = {}
+        for i, (x, _) in enumerate(level.iter_enemies()):
+            self._enemy_index.setdefault(x // chunk_width, []).append(i)
+            
+    def chunk(self, index):
+        """チャンクを取得
+        
+        Args:
+            index (int): チャンク番号
+            
+        Returns:
+            Chunk: チャンク（ステージの範囲外ならNone）
+        """
+        if index < 0 or index * self.chunk_width >= self.width:
+            return None
+            
+        left = index * self.chunk_width
+        right = left + self.chunk_width
+        level_rects = self.level.rects
+        rects = []
+        for i in self._rect_index.get(index, ()):
+            x, y, width, height = level_rects[i * 4:i * 4 + 4]
+            x0 = max(x, left)
+            x1 = min(x + width, right)
+            rects.append((x0, y, x1 - x0, height))
+            
+        level_enemies = self.level.enemies
+        enemies = [(level_enemies[i * 2], level_enemies[i * 2 + 1])
+                   for i in self._enemy_index.get(index, ())]
+        
+        goal = self.level.goal
+        if goal is None or not left <= goal[0] < right:
+            goal = None
+        return Chunk(rects, enemies, goal)
+
+
+class GeneratedChunkSource:
+    """終わりのないステージのチャンクを生成するクラス
+    
+    チャンクの内容は (シード, チャンク番号) だけで決まるため、
+    一度破棄したチャンクも同じ内容で作り直せる。
+    """
+    
+    # 地面の高さ（Y座標）とタイルの一辺の長さ
+    GROUND_Y = 500
+    TILE_SIZE = 50
+    
+    # 穴の幅（タイル数。ダッシュジャンプで渡れる幅まで）
+    GAP_TILES = (2, 3, 4)
+    
+    # 障害物の高さ（ジャンプで越えられる高さまで）
+    OBSTACLE_HEIGHTS = (100, 150)
+    
+    # 終わりのないステージの幅（カメラの移動範囲の上限として使う）
+    ENDLESS_WIDTH = 10 ** 9
+    
+    def __init__(self, seed, chunk_width, num_chunks=None):
+        """初期化
+        
+        Args:
+            seed (int): 乱数のシード
+            chunk_width (int): チャンク1つの幅（ピクセル、タイルサイズの倍数）
+            num_chunks (int): チャンク数（Noneなら終わりなし。最後のチャンクにゴールを置く）
+        """
+        self.seed = seed
+        self.chunk_width = chunk_width
+        self.num_chunks = num_chunks
+        self.width = chunk_width * num_chunks if num_chunks else self.ENDLESS_WIDTH
+        self.start = (100, 400)
+        self.checkpoints = []
+        
+    def chunk(self, index):
+        """チャンクを生成
+        
+        Args:
+            index (int): チャンク番号
+            
+        Returns:
+            Chunk: チャンク（ステージの範囲外ならNone）
+        """
+        if index < 0 or (self.num_chunks is not None and index >= self.num_chunks):
+            return None
+            
+        tile = self.TILE_SIZE
+        cols = self.chunk_width // tile
+        left = index * self.chunk_width
+        ground_y = self.GROUND_Y
+        rng = random.Random(self.seed * 1000003 + index)
+        
+        # 最初と最後のチャンクは平らな地面だけにする
+        last = self.num_chunks is not None and index == self.num_chunks - 1
+        if index == 0 or last:
+            goal = (left + self.chunk_width - 200, ground_y - 80) if last else None
+            return Chunk([(left, ground_y, self.chunk_width, tile)], [], goal)
+            
+        # 地面（チャンクの中ほどに穴を1つ空けることがある）
+        ground = [True] * cols
+        if rng.random() < 0.5:
+            gap = rng.choice(self.GAP_TILES)
+            start = rng.randrange(3, cols - gap - 3)
+            ground[start:start + gap] = [False] * gap
+            
+        # 障害物（穴の手前・直後には置かない）
+        obstacles = {}
+        for _ in range(rng.randrange(3)):
+            col = rng.randrange(2, cols - 2)
+            if all(ground[col - 2:col + 3]):
+                obstacles[col] = rng.choice(self.OBSTACLE_HEIGHTS)
+                
+        rects = []
+        col = 0
+        while col < cols:
+            if not ground[col]:
+                col += 1
+                continue
+            end = col
+            while end < cols and ground[end]:
+                end += 1
+            rects.append((left + col * tile, ground_y, (end - col) * tile, tile))
+            col = end
+        for col, height in sorted(obstacles.items()):
+            rects.append((left + col * tile, ground_y - height, tile, height))
+            
+        # 敵（地面があり障害物の無いタイルに置く）
+        enemies = []
+        for _ in range(rng.randrange(3)):
+            col = rng.randrange(1, cols - 1)
+            if ground[col] and col not in obstacles:
+                enemies.append((left + col * tile + 10, ground_y - 30))
+                
+        return Chunk(rects, enemies)
+
+
+class StreamingStage(Stage):
+    """チャンク単位で読み込むステージ
+    
+    カメラに近づいたチャンクのブロック・敵を作成し、カメラの後方に離れたチャンクは破棄する。
+    同時に存在するチャンクは画面幅とその前後の数チャンクに限られるため、
+    ステージの長さによらずメモリ使用量と1フレームあたりの処理量は一定に収まる。
+    
+    チャンクの入れ替えで敵が作り直されるため、スナップショット（巻き戻し・チェックポイント）には対応しない。
+    """
+    
+    # カメラの前方・後方に保持するチャンク数
+    CHUNKS_AHEAD = 1
+    CHUNKS_BEHIND = 1
+    
+    def __init__(self, source, height, view_width=800):
+        """初期化
+        
+        Args:
+            source: チャンクの供給元（LevelChunkSource または GeneratedChunkSource）
+            height (int): ステージの高さ
+            view_width (int): 画面の幅
+        """
+        self.source = source
+        self.chunk_width = source.chunk_width
+        self.view_width = view_width
+        
+        # チャンク番号 -> (ブロックのリスト, 敵のリスト, ゴール)
+        self.active_chunks = {}
+        
+        super().__init__(source.width, height)
+        
+    def _create_stage(self):
+        """スタート位置の周囲のチャンクを読み込む"""
+        self.start_x, self.start_y = self.source.start
+        self.checkpoints = list(self.source.checkpoints)
+        self._stream(0)
+        
+    def _stream(self, camera_offset_x):
+        """カメラ位置に合わせてチャンクを読み込み・破棄する
+        
+        Args:
+            camera_offset_x (int): カメラのXオフセット
+        """
+        first = max(camera_offset_x // self.chunk_width - self.CHUNKS_BEHIND, 0)
+        last = (camera_offset_x + self.view_width - 1) // self.chunk_width + self.CHUNKS_AHEAD
+        
+        for index in [i for i in self.active_chunks if not first <= i <= last]:
+            self._retire_chunk(index)
+        for index in range(first, last + 1):
+            if index not in self.active_chunks:
+                self._activate_chunk(index)
+                
+    def _activate_chunk(self, index):
+        """チャンクのブロック・敵を作成
+        
+        Args:
+            index (int): チャンク番号
+        """
+        chunk = self.source.chunk(index)
+        if chunk is None:
+            return
+            
+        blocks = []
+        for x, y, width, height in chunk.rects:
+            block = Block(x, y, width, height)
+            self.blocks.add(block)
+            self.block_grid.add(block)
+            blocks.append(block)
+            
+        enemies = []
+        for x, y in chunk.enemies:
+            enemy = Enemy(x, y)
+            self.enemies.add(enemy)
+            self.enemy_broadphase.add(enemy)
+            enemies.append(enemy)
+            
+        goal = None
+        if chunk.goal is not None:
+            goal = self.goal = Goal(*chunk.goal)
+            
+        self.active_chunks[index] = (blocks, enemies, goal)
+        
+    def _retire_chunk(self, index):
+        """チャンクのブロック・敵を破棄
+        
+        Args:
+            index (int): チャンク番号
+        """
+        blocks, enemies, goal = self.active_chunks.pop(index)
+        for block in blocks:
+            self.block_grid.remove(block)
+            block.kill()
+        for enemy in enemies:
+            if enemy in self.enemy_broadphase:
+                self.enemy_broadphase.remove(enemy)
+            enemy.kill()
+        self._forget_defeated(enemies)
+        if goal is not None and self.goal is goal:
+            self.goal = None
+            
+    def enable_enemy_lod(self, view_width, margin=None):
+        """敵のLODは使わない（チャンクの入れ替えでブロックが変わり、敵の移動範囲を決められないため。
+        敵が存在するのは画面の近くのチャンクだけなので、更新の量はもともと一定に収まる）
+        
+        Args:
+            view_width (int): 画面の幅
+            margin (int): 画面端から敵を眠らせるまでの距離
+        """
+        
+    def update(self, camera_offset_x=0, focus_rect=None):
+        """ステージの状態を更新
+        
+        Args:
+            camera_offset_x (int): カメラのXオフセット
+            focus_rect (pygame.Rect): 画面外でも敵を通常どおり更新する範囲
+        """
+        self._stream(camera_offset_x)
+        super().update(camera_offset_x, focus_rect)
+        
+    def reset(self):
+        """ステージをリセット（全てのチャンクを破棄し、スタート位置から読み込み直す）"""
+        for index in list(self.active_chunks):
+            self._retire_chunk(index)
+        self._clear_defeated()
+        self._stream(0)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+タイルマップモジュール
+"""
+
+import bisect
+import pygame
+
+
+class TileMap:
+    """タイルマップクラス
+    
+    地形を行ごとのランレングス（連続するタイルの区間）で保持する。
+    タイル1枚ごとにスプライトを作らず、連続した区間をまとめて扱う。
+    """
+    
+    def __init__(self, width, height, tile_size=50):
+        """初期化
+        
+        Args:
+            width (int): マップの幅（ピクセル）
+            height (int): マップの高さ（ピクセル）
+            tile_size (int): タイル1枚の一辺の長さ（ピクセル）
+        """
+        self.tile_size = tile_size
+        self.cols = -(-width // tile_size)
+        self.rows = -(-height // tile_size)
+        
+        # 各行の区間リスト [(開始列, 終了列), ...]（終了列は含まない、昇順で重なりなし）
+        self.runs = [[] for _ in range(self.rows)]
+        
+    def fill_rect(self, x, y, width, height):
+        """矩形範囲をタイルで埋める
+        
+        Args:
+            x (int): X座標
+            y (int): Y座標
+            width (int): 幅
+            height (int): 高さ
+        """
+        size = self.tile_size
+        col0 = max(x // size, 0)
+        col1 = min(-(-(x + width) // size), self.cols)
+        row0 = max(y // size, 0)
+        row1 = min(-(-(y + height) // size), self.rows)
+        if col0 >= col1:
+            return
+            
+        for row in range(row0, row1):
+            self._add_run(row, col0, col1)
+            
+    def _add_run(self, row, start, end):
+        """行に区間を追加し、隣接・重複する区間と結合する
+        
+        Args:
+            row (int): 行番号
+            start (int): 開始列
+            end (int): 終了列（含まない）
+        """
+        runs = self.runs[row]
+        
+        # 結合対象となる区間の範囲を探す
+        i = bisect.bisect_left(runs, (start,))
+        if i > 0 and runs[i - 1][1] >= start:
+            i -= 1
+        j = i
+        while j < len(runs) and runs[j][0] <= end:
+            start = min(start, runs[j][0])
+            end = max(end, runs[j][1])
+            j += 1
+            
+        runs[i:j] = [(start, end)]
+        
+    def is_solid(self, col, row):
+        """タイルが埋まっているかどうか
+        
+        Args:
+            col (int): 列番号
+            row (int): 行番号
+            
+        Returns:
+            bool: 埋まっている場合はTrue
+        """
+        if not (0 <= row < self.rows):
+            return False
+        runs = self.runs[row]
+        i = bisect.bisect_right(runs, (col, self.cols + 1)) - 1
+        return i >= 0 and runs[i][0] <= col < runs[i][1]
+        
+    def rects(self):
+        """地形を矩形のリストとして取得
+        
+        同じ列範囲の区間が縦に連続している場合は1つの矩形にまとめる。
+        
+        Returns:
+            list: pygame.Rect のリスト（上の行から順、同じ行では左から順）
+        """
+        size = self.tile_size
+        rects = []
+        open_rects = {}  # (開始列, 終了列) -> 縦に伸ばしている途中の矩形
+        
+        for row, runs in enumerate(self.runs):
+            next_open = {}
+            for run in runs:
+                rect = open_rects.get(run)
+                if rect is None:
+                    rect = pygame.Rect(run[0] * size, row * size,
+                                       (run[1] - run[0]) * size, size)
+                    rects.append(rect)
+                else:
+                    rect.height += size
+                next_open[run] = rect
+            open_rects = next_open
+            
+        return rects
+        
+    def run_count(self):
+        """区間の総数
+        
+        Returns:
+            int: 全行の区間数の合計
+        """
+        return sum(len(runs) for runs in self.runs)
@@ -5,11 +5,18 @@
 UIモジュール
 """
 
+from collections import OrderedDict
 import pygame
 
 class UI:
     """UIクラス"""
     
+    # 描画済みテキスト・オーバーレイのキャッシュ上限
+    SURFACE_CACHE_SIZE = 64
+    
+    # フォントの大きさ
+    FONT_SIZES = {"large": 72, "medium": 48, "small": 36}
+    
     def __init__(self, width, height):
         """初期化
         
@@ -20,11 +27,100 @@ class UI:
         self.width = width
         self.height = height
         
-        # フォントの初期化
-        pygame.font.init()
-        self.font_large = pygame.font.SysFont(None, 72)
-        self.font_medium = pygame.font.SysFont(None, 48)
-        self.font_small = pygame.font.SysFont(None, 36)
+        # フォント（最初に使うときに作成する）
+        self._fonts = {}
+        
+        # 描画済みSurfaceのキャッシュ（最近使ったものほど末尾）
+        self._surface_cache = OrderedDict()
+        
+    def _font(self, name):
+        """フォントを取得（なければ作成する）
+        
+        pygame標準のフォントを直接読み込む。SysFont と違いシステムのフォント一覧を調べないため速い。
+        
+        Args:
+            name (str): フォントの種類（FONT_SIZES のキー）
+            
+        Returns:
+            pygame.font.Font: フォント
+        """
+        font = self._fonts.get(name)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = self._fonts[name] = pygame.font.Font(None, self.FONT_SIZES[name])
+        return font
+        
+    @property
+    def font_large(self):
+        """大きいフォント（タイトル・メッセージ）"""
+        return self._font("large")
+        
+    @property
+    def font_medium(self):
+        """中くらいのフォント（選択肢・案内）"""
+        return self._font("medium")
+        
+    @property
+    def font_small(self):
+        """小さいフォント（残機）"""
+        return self._font("small")
+        
+    def _cache_surface(self, key, create):
+        """キャッシュからSurfaceを取得（なければ作成して登録する）
+        
+        Args:
+            key (tuple): キャッシュのキー
+            create (callable): Surfaceを作成する関数
+            
+        Returns:
+            pygame.Surface: キャッシュされたSurface
+        """
+        surface = self._surface_cache.get(key)
+        if surface is not None:
+            self._surface_cache.move_to_end(key)
+            return surface
+            
+        surface = create()
+        self._surface_cache[key] = surface
+        
+        # 最も長く使われていないものから破棄
+        while len(self._surface_cache) > self.SURFACE_CACHE_SIZE:
+            self._surface_cache.popitem(last=False)
+            
+        return surface
+        
+    def render_text(self, font, text, color):
+        """テキストを描画したSurfaceを取得
+        
+        同じフォント・文字列・色の組み合わせは一度だけ描画して再利用する。
+        
+        Args:
+            font (pygame.font.Font): フォント
+            text (str): 文字列
+            color (tuple): 文字色
+            
+        Returns:
+            pygame.Surface: テキストのSurface
+        """
+        return self._cache_surface(("text", font, text, color),
+                                   lambda: font.render(text, True, color))
+                                   
+    def get_overlay(self, color):
+        """画面全体を覆う半透明のSurfaceを取得
+        
+        Args:
+            color (tuple): 塗りつぶす色（RGBA）
+            
+        Returns:
+            pygame.Surface: オーバーレイのSurface
+        """
+        def create():
+            overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+            overlay.fill(color)
+            return overlay
+            
+        return self._cache_surface(("overlay", color), create)
         
     def draw_start_screen(self, screen):
         """スタート画面を描画
@@ -36,12 +132,12 @@ class UI:
         screen.fill((135, 206, 235))  # 空色
         
         # タイトル
-        title_text = self.font_large.render("Super Cline Brothers", True, (255, 255, 255))
+        title_text = self.render_text(self.font_large, "Super Cline Brothers", (255, 255, 255))
         title_rect = title_text.get_rect(center=(self.width // 2, self.height // 2 - 50))
         screen.blit(title_text, title_rect)
         
         # スタート指示
-        start_text = self.font_medium.render("Press A to Start", True, (255, 255, 255))
+        start_text = self.render_text(self.font_medium, "Press A to Start", (255, 255, 255))
         start_rect = start_text.get_rect(center=(self.width // 2, self.height // 2 + 50))
         screen.blit(start_text, start_rect)
         
@@ -53,24 +149,22 @@ class UI:
             selection (int): 選択中の項目（0: Yes, 1: No）
         """
         # 半透明の黒背景
-        overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 128))
-        screen.blit(overlay, (0, 0))
+        screen.blit(self.get_overlay((0, 0, 0, 128)), (0, 0))
         
         # メッセージ
-        message_text = self.font_large.render("Continue?", True, (255, 255, 255))
+        message_text = self.render_text(self.font_large, "Continue?", (255, 255, 255))
         message_rect = message_text.get_rect(center=(self.width // 2, self.height // 2 - 50))
         screen.blit(message_text, message_rect)
         
         # Yes選択肢
         yes_color = (255, 255, 0) if selection == 0 else (255, 255, 255)  # 選択中は黄色
-        yes_text = self.font_medium.render("Yes", True, yes_color)
+        yes_text = self.render_text(self.font_medium, "Yes", yes_color)
         yes_rect = yes_text.get_rect(center=(self.width // 2 - 100, self.height // 2 + 50))
         screen.blit(yes_text, yes_rect)
         
         # No選択肢
         no_color = (255, 255, 0) if selection == 1 else (255, 255, 255)  # 選択中は黄色
-        no_text = self.font_medium.render("No", True, no_color)
+        no_text = self.render_text(self.font_medium, "No", no_color)
         no_rect = no_text.get_rect(center=(self.width // 2 + 100, self.height // 2 + 50))
         screen.blit(no_text, no_rect)
         
@@ -86,14 +180,14 @@ class UI:
         
         # メッセージ
         if is_cleared:
-            message_text = self.font_large.render("Congrats!!!", True, (255, 255, 0))
+            message_text = self.render_text(self.font_large, "Congrats!!!", (255, 255, 0))
         else:
-            message_text = self.font_large.render("Game Over....", True, (255, 0, 0))
+            message_text = self.render_text(self.font_large, "Game Over....", (255, 0, 0))
         message_rect = message_text.get_rect(center=(self.width // 2, self.height // 2 - 50))
         screen.blit(message_text, message_rect)
         
         # リトライ指示
-        retry_text = self.font_medium.render("Retry", True, (255, 255, 255))
+        retry_text = self.render_text(self.font_medium, "Retry", (255, 255, 255))
         retry_rect = retry_text.get_rect(center=(self.width // 2, self.height // 2 + 50))
         screen.blit(retry_text, retry_rect)
         
@@ -103,6 +197,9 @@ class UI:
         Args:
             screen (pygame.Surface): 描画対象の画面
             lives (int): 残機数
+            
+        Returns:
+            pygame.Rect: 描画した範囲
         """
-        lives_text = self.font_small.render(f"Lives: {lives}", True, (255, 255, 255))
-        screen.blit(lives_text, (self.width - 150, 20))
+        lives_text = self.render_text(self.font_small, f"Lives: {lives}", (255, 255, 255))
+        return screen.blit(lives_text, (self.width - 150, 20))
@@ -5,6 +5,7 @@
 ゲーム実行スクリプト
 """
 
+import argparse
 import sys
 import os
 
@@ -13,8 +14,32 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # ゲームを実行
 from game.main import Game
+from game.replay import Replayer
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Super Cline Brothers")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="変化した範囲だけを画面に反映する描画モード（低スペック機向け）")
+    parser.add_argument("--record", metavar="PATH",
+                        help="プレイ中の入力をファイルに記録する（終了時に保存）")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="記録した入力を待ち時間なしで再生する")
+    parser.add_argument("--profile", action="store_true",
+                        help="処理時間（p50/p95/p99）と処理落ちフレーム数を画面に表示する")
+    parser.add_argument("--level", metavar="NAME",
+                        help="遊ぶレベル（game/levels 内のレベル名、またはJSONファイルのパス）")
+    parser.add_argument("--seed", metavar="SEED", type=int,
+                        help="シードから自動生成したステージで遊ぶ（生成したステージは保存して再利用する）")
+    parser.add_argument("--endless", metavar="SEED", type=int,
+                        help="シードから生成する終わりのないステージで遊ぶ")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="フレームごとの処理時間をファイルに出力する（.json ならトレースイベント形式、それ以外はCSV）")
+    parser.add_argument("--vsync", action="store_true",
+                        help="画面の更新を垂直同期に合わせる")
+    parser.add_argument("--max-fps", metavar="FPS", type=int, default=0,
+                        help="描画の最大フレームレート（既定は0で制限なし。物理演算は常に60Hz）")
+    args = parser.parse_args()
+    
     print("忍者の如く、ゲームを起動するでござる！")
     print("操作方法でござる：")
     print("・左右キー：移動")
@@ -22,8 +47,20 @@ if __name__ == "__main__":
     print("・スペースキー：ジャンプ")
     print("・Aキー：ゲーム開始")
     print("・Enterキー：決定")
+    print("・Backspaceキー：巻き戻し")
     print("敵は上から踏むと倒せるでござる！穴に落ちないよう気をつけるでござる！")
     print("穴はダッシュジャンプで飛び越えられるでござるぞ！")
     
-    game = Game()
-    game.run()
+    # 自動生成するステージは、スタート画面を表示している間に別スレッドで生成する
+    game = Game(dirty_rects=args.dirty_rects, record_path=args.record,
+                profile=args.profile, trace_path=args.trace, level=args.level,
+                endless_seed=args.endless, vsync=args.vsync, max_fps=args.max_fps, seed=args.seed)
+    try:
+        if args.replay:
+            frames = Replayer(args.replay).play(game, draw=True)
+            print(f"{frames}フレームを再生したでござる（状態: {game.game_state.state}, 残機: {game.game_state.lives}）")
+        else:
+            game.run()
+    finally:
+        # 再生の終了時もウィンドウを閉じたときと同じ終了処理を行う（トレースファイルを閉じるなど）
+        game.close()